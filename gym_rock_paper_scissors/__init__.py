@@ -1,9 +1,33 @@
+import sys
 import logging
-from gym.envs.registration import register
 
 logger = logging.getLogger(__name__)
 
-register(
-    id='RockPaperScissors-v0',
-    entry_point='gym_rock_paper_scissors.envs:RockPaperScissorsEnv',
-)
+
+def register_envs():
+    '''
+    Registers the environments in gym's registry. Importing this package does not import gym:
+    registration happens when this package is imported after gym, when the gym environment classes are
+    first accessed, and, for installed packages, when gym.envs loads its 'gym.envs' entry points.
+    Errors are logged rather than raised, as gym does for its plugins, so that they never break importing gym
+    '''
+    try:
+        from gym.envs.registration import register, registry
+        # registry is a dict of specs in recent gym releases, and an EnvRegistry in older ones
+        registered_ids = registry if isinstance(registry, dict) else registry.env_specs
+        if 'RockPaperScissors-v0' in registered_ids: return
+        register(
+            id='RockPaperScissors-v0',
+            entry_point='gym_rock_paper_scissors.envs:RockPaperScissorsEnv',
+        )
+
+        register(
+            id='BatchedRockPaperScissors-v0',
+            entry_point='gym_rock_paper_scissors.envs:BatchedRockPaperScissorsEnv',
+        )
+    except Exception as e:
+        logger.warning("Could not register gym_rock_paper_scissors environments: {}".format(e))
+
+
+if 'gym.envs' in sys.modules:
+    register_envs()
@@ -0,0 +1 @@
+from .exploitability import action_values, best_response, nash_conv, exploitability, PolicyExploitability
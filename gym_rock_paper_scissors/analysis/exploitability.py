@@ -0,0 +1,199 @@
+import numpy as np
+
+from ..envs import compile_tabular_mdp
+from ..envs.tabular_mdp import DEFAULT_MEMORY_BUDGET
+
+
+def support_vector_of(strategy):
+    '''
+    :param strategy: support vector, or agent with a support_vector such as MixedStrategyAgent
+    :returns: float array with the probability of every action
+    '''
+    return np.asarray(getattr(strategy, 'support_vector', strategy), dtype=np.float64)
+
+
+def action_values(payoff_tensor, strategies, player):
+    '''
+    Expected reward of every action of a player in a single round, against the mixed strategies of the other players
+    :param payoff_tensor: (number_of_actions,) * number_of_players + (number_of_players,) payoff tensor of the environment
+    :param strategies: support vector (or MixedStrategyAgent) of every player. The strategy of :param: player is ignored
+    :param player: index of the player whose actions are evaluated
+    :returns: array of shape (number_of_actions,)
+    '''
+    values = np.moveaxis(np.asarray(payoff_tensor)[..., player], player, 0)
+    for strategy in reversed([strategy for other_player, strategy in enumerate(strategies) if other_player != player]):
+        values = values @ support_vector_of(strategy)
+    return values
+
+
+def best_response(payoff_tensor, strategies, player):
+    '''
+    Computes a pure best response against the mixed strategies of the other players
+    :param payoff_tensor: payoff tensor of the environment, see action_values
+    :param strategies: support vector (or MixedStrategyAgent) of every player. The strategy of :param: player is ignored
+    :param player: index of the best responding player
+    :returns: (best response action, its expected reward in a single round)
+    '''
+    values = action_values(payoff_tensor, strategies, player)
+    action = int(np.argmax(values))
+    return action, float(values[action])
+
+
+def nash_conv(env, strategies):
+    '''
+    Sum over every player of the expected cumulative reward that it would gain over an episode
+    by switching from its strategy to a best response, while the other players keep theirs.
+    It is 0 if and only if the strategies form a Nash equilibrium
+    :param env: environment (or engine) providing payoff_tensor and max_repetitions
+    :param strategies: support vector (or MixedStrategyAgent) of every player
+    :throws ValueError: If there is not a strategy for every player of :param: env
+    :returns: float
+    '''
+    if len(strategies) != env.number_of_players:
+        raise ValueError("Parameter strategies should contain a strategy for each of the {} players".format(env.number_of_players))
+    gains = 0.
+    for player, strategy in enumerate(strategies):
+        values = action_values(env.payoff_tensor, strategies, player)
+        gains += values.max() - values @ support_vector_of(strategy)
+    return float(env.max_repetitions * gains)
+
+
+def exploitability(env, strategy, player=0, memory_budget=DEFAULT_MEMORY_BUDGET):
+    '''
+    Expected cumulative reward obtained over an episode by a best response against :param: strategy,
+    played by the other player of a two player game. For symmetric zero sum games, such as those built from
+    the payoff_* parameters of the environment, the value of the game is 0, so a strategy cannot be exploited
+    if and only if its exploitability is 0.
+    :param env: environment (or engine) providing the payoffs, stacked_observations and max_repetitions
+    :param strategy: Either a mixed strategy, as a support vector or MixedStrategyAgent, or a history conditioned policy,
+                     as a (state_space_size, number_of_actions) array of action probabilities indexed by state hash
+    :param player: index of the player using :param: strategy
+    :param memory_budget: Maximum number of bytes of the compiled tables used to analyse history conditioned policies
+    :throws ValueError: If :param: env is not a two player game, or :param: strategy is invalid
+    :returns: float
+    '''
+    if env.number_of_players != 2:
+        raise ValueError("Exploitability is computed for two player games. Given env with {} players".format(env.number_of_players))
+    if np.ndim(support_vector_of(strategy)) == 2:
+        return PolicyExploitability(env, strategy, player, memory_budget).exploitability
+    strategies = [None, None]
+    strategies[player] = strategy
+    _, value = best_response(env.payoff_tensor, strategies, 1 - player)
+    return env.max_repetitions * value
+
+
+class PolicyExploitability():
+    '''
+    Exact best response against a history conditioned policy, in which a player picks its actions
+    from a distribution that depends on the state hash (see RockPaperScissorsEngine.hash_state).
+    The best response is computed by backward induction over the rounds of an episode, using the
+    compiled tables of the environment (see compile_tabular_mdp):
+        Q[t, s, b] = sum_a policy[s, a] * (reward(a, b) + V[t + 1, next_state(s, (a, b))])
+        V[t, s]    = max_b Q[t, s, b],    V[max_repetitions, s] = 0
+    where a and b are the actions of the policy and of the best response. After t rounds the state
+    recalls exactly min(t, stacked_observations) joint actions, so only those states are evaluated.
+    When the policy changes in a few states, update only recomputes the values of those states
+    and of the states from which they can be reached.
+
+    Example usage:
+    analysis = PolicyExploitability(env, policy)
+    analysis.exploitability                      # Expected episode return of the best response
+    analysis.update(state_hashes, distributions) # Exploitability of the updated policy
+    '''
+
+    def __init__(self, env, policy, player=0, memory_budget=DEFAULT_MEMORY_BUDGET):
+        '''
+        :param env: two player environment (or engine) providing the payoffs, stacked_observations and max_repetitions
+        :param policy: (state_space_size, number_of_actions) array of action probabilities indexed by state hash.
+                       A support vector, or MixedStrategyAgent, is used in every state
+        :param player: index of the player using :param: policy
+        :param memory_budget: Maximum number of bytes of the compiled tables
+        :throws ValueError: If :param: env is not a two player game, or :param: policy is not a valid policy
+        '''
+        if env.number_of_players != 2:
+            raise ValueError("Exploitability is computed for two player games. Given env with {} players".format(env.number_of_players))
+        if player not in (0, 1):
+            raise ValueError("Parameter player should be 0 or 1. Given: {}".format(player))
+        self.player = player
+        self.max_repetitions = env.max_repetitions
+        self.stacked_observations = env.stacked_observations
+        self.state_space_size = env.state_space_size
+        self.hash_offsets = env.hash_offsets
+        tabular_mdp = env.tabular_mdp if getattr(env, 'tabular_mdp', None) is not None else compile_tabular_mdp(env, memory_budget)
+        self.next_states = tabular_mdp.next_states
+
+        # joint_action_indices[a, b] is the index of the joint action in which the policy plays a and the best response b
+        actions = np.arange(env.action_space_size)
+        policy_actions, response_actions = np.meshgrid(actions, actions, indexing='ij')
+        joint_actions = np.stack([policy_actions, response_actions] if player == 0 else [response_actions, policy_actions], axis=-1)
+        self.joint_action_indices = env.encode_joint_actions(joint_actions)
+        self.rewards = tabular_mdp.rewards[self.joint_action_indices, 1 - player]
+
+        self.policy = self.validate_policy(np.broadcast_to(support_vector_of(policy), (self.state_space_size, env.action_space_size)).copy())
+        self.values         = np.zeros((self.max_repetitions + 1, self.state_space_size))
+        self.best_responses = np.zeros((self.max_repetitions, self.state_space_size), dtype=np.int64)
+        for repetition in reversed(range(self.max_repetitions)):
+            self.evaluate(repetition, self.layer(repetition))
+
+    def validate_policy(self, policy):
+        if policy.shape[-1] != self.rewards.shape[0] or np.any(policy < 0) or not np.allclose(policy.sum(axis=-1), 1):
+            raise ValueError("Every distribution of the policy should contain a non negative probability for each of the {} actions, "
+                             "which sum up to 1".format(self.rewards.shape[0]))
+        return policy
+
+    def layer(self, repetition):
+        '''
+        :returns: range of the state hashes which recall min(repetition, stacked_observations) joint actions
+        '''
+        recalled_joint_actions = min(repetition, self.stacked_observations)
+        return range(self.hash_offsets[recalled_joint_actions], self.hash_offsets[recalled_joint_actions + 1]
+                     if recalled_joint_actions < self.stacked_observations else self.state_space_size)
+
+    def evaluate(self, repetition, states):
+        '''
+        Recomputes the values and best responses of :param: states before round :param: repetition
+        '''
+        successors = self.next_states[states][:, self.joint_action_indices]
+        response_values = np.einsum('sa,sab->sb', self.policy[states], self.rewards + self.values[repetition + 1][successors])
+        self.best_responses[repetition, states] = np.argmax(response_values, axis=-1)
+        self.values[repetition, states] = response_values.max(axis=-1)
+
+    @property
+    def exploitability(self):
+        '''
+        Expected cumulative reward of the best response over an episode, starting from the empty state
+        '''
+        return float(self.values[0, 0])
+
+    def best_response_action(self, state_hash, repetition):
+        '''
+        :param state_hash: hash of the current state
+        :param repetition: number of rounds already played in the episode
+        :returns: action of the best response
+        '''
+        return int(self.best_responses[repetition, state_hash])
+
+    def update(self, state_hashes, distributions):
+        '''
+        Changes the policy in :param: state_hashes, and updates the best response and its values
+        :param state_hashes: integer array of the state hashes whose distributions change
+        :param distributions: (len(state_hashes), number_of_actions) array of the new action probabilities
+        :throws ValueError: If :param: distributions are not valid distributions over actions
+        :returns: exploitability of the updated policy
+        '''
+        state_hashes = np.asarray(state_hashes, dtype=np.int64)
+        self.policy[state_hashes] = self.validate_policy(np.asarray(distributions, dtype=np.float64))
+        changed = np.zeros(self.state_space_size, dtype=bool)
+        changed[state_hashes] = True
+        # A value changes if the policy changed in its state, or if the value of a successor changed
+        changed_values = np.zeros(self.state_space_size, dtype=bool)
+        for repetition in reversed(range(self.max_repetitions)):
+            layer = self.layer(repetition)
+            successors = self.next_states[layer.start:layer.stop]
+            dirty = changed[layer.start:layer.stop] | changed_values[successors].any(axis=-1)
+            changed_values[:] = False
+            if dirty.any():
+                states = np.flatnonzero(dirty) + layer.start
+                self.evaluate(repetition, states)
+                changed_values[states] = True
+        return self.exploitability
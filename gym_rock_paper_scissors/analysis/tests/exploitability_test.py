@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from .. import action_values, best_response, nash_conv, exploitability, PolicyExploitability
+from ...envs import RockPaperScissorsEngine, cyclic_payoff_tensor
+from ...fixed_agents import rockAgent, randomAgent, MixedStrategyAgent
+
+
+def beat_last_opponent_action_policy(env, player=0):
+    '''
+    Policy which plays the action beating the opponent's last action, and uniformly at random in the empty state
+    '''
+    policy = np.full((env.state_space_size, 3), 1 / 3)
+    last_joint_actions = env.unhash_states(np.arange(1, env.state_space_size))[:, -1]
+    last_opponent_actions = last_joint_actions // 3 if player == 1 else last_joint_actions % 3
+    policy[1:] = np.eye(3)[(last_opponent_actions + 1) % 3]
+    return policy
+
+
+def expectimax(env, policy, state_hash, repetition, player):
+    '''
+    Value of a best response, computed by recursively expanding every joint action with transition_state_hashes
+    '''
+    if repetition == env.max_repetitions: return 0.
+    response_values = []
+    for response in range(env.action_space_size):
+        value = 0.
+        for action in range(env.action_space_size):
+            joint_action = [action, response] if player == 0 else [response, action]
+            joint_action_index = env.encode_joint_action(joint_action)
+            next_state_hash = int(env.transition_state_hashes(state_hash, joint_action_index))
+            value += policy[state_hash, action] * (env.joint_action_rewards[joint_action_index, 1 - player] +
+                                                   expectimax(env, policy, next_state_hash, repetition + 1, player))
+        response_values.append(value)
+    return max(response_values)
+
+
+def test_action_values_and_best_response_of_mixed_strategies():
+    payoff_tensor = RockPaperScissorsEngine().payoff_tensor
+    np.testing.assert_allclose(action_values(payoff_tensor, [None, rockAgent], 0), [0, 1, -1])
+    np.testing.assert_allclose(action_values(payoff_tensor, [[0.5, 0.5, 0], None], 1), [-0.5, 0.5, 0])
+    assert best_response(payoff_tensor, [rockAgent, None], 1) == (1, 1.)
+
+
+@pytest.mark.parametrize('player', [0, 1])
+def test_exploitability_of_mixed_strategies(player):
+    env = RockPaperScissorsEngine(max_repetitions=10)
+    assert exploitability(env, rockAgent, player) == 10
+    assert exploitability(env, randomAgent, player) == pytest.approx(0)
+    assert exploitability(env, [0.5, 0.5, 0], player) == pytest.approx(5)
+    # Rock is worth more than the other actions, so the uniform strategy can be exploited
+    assert exploitability(RockPaperScissorsEngine(payoff_rock_vs_scissors=3), randomAgent, player) > 0
+
+
+def test_nash_conv():
+    env = RockPaperScissorsEngine(max_repetitions=4)
+    assert nash_conv(env, [randomAgent, randomAgent]) == pytest.approx(0)
+    assert nash_conv(env, [rockAgent, rockAgent]) == pytest.approx(8)
+    three_player_env = RockPaperScissorsEngine(number_of_players=3, max_repetitions=1)
+    assert nash_conv(three_player_env, [randomAgent] * 3) == pytest.approx(0)
+    with pytest.raises(ValueError):
+        nash_conv(three_player_env, [randomAgent] * 2)
+
+
+@pytest.mark.parametrize('player', [0, 1])
+def test_stationary_policies_match_mixed_strategies(player):
+    env = RockPaperScissorsEngine(stacked_observations=2, max_repetitions=5, payoff_rock_vs_scissors=2)
+    agent = MixedStrategyAgent(support_vector=[0.2, 0.5, 0.3], name='Biased')
+    policy = np.tile(agent.support_vector, (env.state_space_size, 1))
+    assert PolicyExploitability(env, agent, player).exploitability == pytest.approx(exploitability(env, agent, player))
+    assert exploitability(env, policy, player) == pytest.approx(exploitability(env, agent, player))
+
+
+@pytest.mark.parametrize('player', [0, 1])
+def test_best_response_exploits_history_conditioned_policy(player):
+    env = RockPaperScissorsEngine(stacked_observations=1, max_repetitions=6)
+    analysis = PolicyExploitability(env, beat_last_opponent_action_policy(env, player), player)
+    # Every round but the first, in which the policy plays uniformly at random, is won by the best response
+    assert analysis.exploitability == pytest.approx(5)
+    last_response = 0
+    joint_action_index = env.encode_joint_action([2, last_response] if player == 0 else [last_response, 2])
+    state_hash = int(env.transition_state_hashes(0, joint_action_index))
+    # After the best response plays ROCK, the policy plays PAPER, which SCISSORS beats
+    assert analysis.best_response_action(state_hash, 1) == 2
+
+
+@pytest.mark.parametrize('stacked_observations, player', [(1, 0), (2, 1), (3, 0)])
+def test_policy_exploitability_matches_expectimax(stacked_observations, player):
+    env = RockPaperScissorsEngine(stacked_observations=stacked_observations, max_repetitions=3, payoff_paper_vs_scissors=-2)
+    policy = np.random.default_rng(0).dirichlet(np.ones(3), size=env.state_space_size)
+    assert PolicyExploitability(env, policy, player).exploitability == pytest.approx(expectimax(env, policy, 0, 0, player))
+
+
+def test_incremental_updates_match_recomputing():
+    env = RockPaperScissorsEngine(stacked_observations=2, max_repetitions=5,
+                                  payoff_matrix=cyclic_payoff_tensor(5)[..., 0], compiled=True)
+    rng = np.random.default_rng(0)
+    policy = rng.dirichlet(np.ones(5), size=env.state_space_size)
+    analysis = PolicyExploitability(env, policy)
+    for number_of_changed_states in [1, 10, env.state_space_size]:
+        state_hashes  = rng.choice(env.state_space_size, size=number_of_changed_states, replace=False)
+        distributions = rng.dirichlet(np.ones(5), size=number_of_changed_states)
+        policy[state_hashes] = distributions
+        expected = PolicyExploitability(env, policy)
+        assert analysis.update(state_hashes, distributions) == pytest.approx(expected.exploitability)
+        np.testing.assert_allclose(analysis.values, expected.values)
+        np.testing.assert_array_equal(analysis.best_responses, expected.best_responses)
+
+
+def test_invalid_arguments_raise_value_error():
+    env = RockPaperScissorsEngine()
+    with pytest.raises(ValueError):
+        exploitability(RockPaperScissorsEngine(number_of_players=3), randomAgent)
+    with pytest.raises(ValueError):
+        PolicyExploitability(env, np.full((env.state_space_size, 3), 0.5))
+    with pytest.raises(ValueError):
+        PolicyExploitability(env, randomAgent, player=2)
+    analysis = PolicyExploitability(env, randomAgent)
+    with pytest.raises(ValueError):
+        analysis.update([0], [[-1, 1, 1]])
@@ -0,0 +1 @@
+from .benchmarks import BENCHMARKS, run_benchmarks, compare_against_baseline
@@ -0,0 +1,187 @@
+import sys
+import time
+import platform
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+
+from ..envs import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv
+from ..fixed_agents import MixedStrategyAgent
+
+
+Benchmark = namedtuple('Benchmark', ['setup', 'batched', 'depends_on_recall'], defaults=[True])
+Benchmark.__doc__ = '''
+:param setup: function taking (stacked_observations, batch_size, rng) which returns the operation to time, a function without arguments.
+              rng is the np.random.Generator from which the inputs of the operation are generated
+:param batched: whether the operation processes batch_size items per call. Unbatched benchmarks only run with a batch size of 1
+:param depends_on_recall: whether the operation depends on stacked_observations. Otherwise the benchmark runs once,
+                          with stacked_observations reported as None
+'''
+
+
+def setup_env_step(stacked_observations, batch_size, rng):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    env.reset()
+    actions = rng.integers(0, 3, size=(1024, 2)).tolist()
+    step = iter_forever(actions)
+    def op():
+        _, _, done, _ = env.step(next(step))
+        if done: env.reset()
+    return op
+
+
+def setup_env_reset(stacked_observations, batch_size, rng):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    return env.reset
+
+
+def setup_env_construction(stacked_observations, batch_size, rng):
+    return lambda: RockPaperScissorsEnv(stacked_observations=stacked_observations)
+
+
+def setup_hash_state(stacked_observations, batch_size, rng):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    state = random_states(env, 1, rng)[0]
+    return lambda: env.hash_state(state)
+
+
+def setup_decode_state(stacked_observations, batch_size, rng):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    state = random_states(env, 1, rng)[0]
+    return lambda: env.decode_state(state)
+
+
+def setup_take_action(stacked_observations, batch_size, rng):
+    agent = MixedStrategyAgent(support_vector=[1/3, 1/3, 1/3], name='RandomAgent', seed=0)
+    return lambda: agent.take_action(None)
+
+
+def setup_batched_env_step(stacked_observations, batch_size, rng):
+    env = BatchedRockPaperScissorsEnv(num_envs=batch_size, stacked_observations=stacked_observations)
+    env.reset()
+    step = iter_forever(rng.integers(0, 3, size=(16, batch_size, 2)))
+    return lambda: env.step(next(step))
+
+
+def setup_hash_states(stacked_observations, batch_size, rng):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    states = random_states(env, batch_size, rng)
+    return lambda: env.hash_states(states)
+
+
+def setup_sample_actions(stacked_observations, batch_size, rng):
+    agent = MixedStrategyAgent(support_vector=[1/3, 1/3, 1/3], name='RandomAgent', seed=0)
+    return lambda: agent.sample_actions(batch_size)
+
+
+BENCHMARKS = {'env_step':         Benchmark(setup_env_step, batched=False),
+              'env_reset':        Benchmark(setup_env_reset, batched=False),
+              'env_construction': Benchmark(setup_env_construction, batched=False),
+              'hash_state':       Benchmark(setup_hash_state, batched=False),
+              'decode_state':     Benchmark(setup_decode_state, batched=False),
+              'take_action':      Benchmark(setup_take_action, batched=False, depends_on_recall=False),
+              'batched_env_step': Benchmark(setup_batched_env_step, batched=True),
+              'hash_states':      Benchmark(setup_hash_states, batched=True),
+              'sample_actions':   Benchmark(setup_sample_actions, batched=True, depends_on_recall=False)}
+
+
+def iter_forever(items):
+    while True:
+        yield from items
+
+
+def random_states(env, number_of_states, rng):
+    '''
+    One hot encoded states where every joint action is recalled
+    '''
+    joint_action_indices = rng.integers(0, env.encoding_size - 1, size=(number_of_states, env.stacked_observations))
+    return env.one_hot_table[joint_action_indices]
+
+
+def run_benchmarks(benchmark_names=None, stacked_observations=range(1, 11), batch_sizes=(1, 64, 4096), min_time=0.2, seed=0):
+    '''
+    Measures the throughput and memory usage of every combination of benchmark, stacked_observations and batch size
+    :param benchmark_names: names of the BENCHMARKS to run. All of them are run if None
+    :param stacked_observations: values of stacked_observations to sweep
+    :param batch_sizes: batch sizes to sweep for batched benchmarks
+    :param min_time: minimum number of seconds during which each operation is timed
+    :param seed: seed for the random number generator used to generate inputs
+    :returns: dictionary with 'metadata' about the machine and a list of 'results'
+    '''
+    rng = np.random.default_rng(seed)
+    results = []
+    for name in (benchmark_names or BENCHMARKS):
+        benchmark = BENCHMARKS[name]
+        for s in (stacked_observations if benchmark.depends_on_recall else [None]):
+            for batch_size in (batch_sizes if benchmark.batched else [1]):
+                results.append(dict(benchmark=name, stacked_observations=s, batch_size=batch_size,
+                                    **measure(benchmark.setup(s, batch_size, rng), batch_size, min_time)))
+    return {'metadata': metadata(), 'results': results}
+
+
+def measure(op, batch_size, min_time):
+    '''
+    Times :param: op and then runs it under tracemalloc to measure its memory usage
+    :returns: dictionary containing:
+        - ops_per_second: calls to :param: op per second
+        - items_per_second: ops_per_second * batch_size, e.g. environment steps per second
+        - allocated_bytes_per_op: peak memory allocated during a single call
+        - allocated_blocks_per_op: memory blocks still allocated after a call, non zero values signal leaks or growing caches
+        - peak_memory_bytes: peak memory traced while running the operation repeatedly
+    '''
+    op()  # Warm up
+    number_of_calls, elapsed_time = 1, 0.
+    while elapsed_time < min_time:
+        number_of_calls *= 2
+        start = time.perf_counter()
+        for _ in range(number_of_calls): op()
+        elapsed_time = time.perf_counter() - start
+    ops_per_second = number_of_calls / elapsed_time
+
+    traced_calls = min(number_of_calls, 100)
+    tracemalloc.start()
+    allocated_bytes = 0
+    for _ in range(traced_calls):
+        current_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        op()
+        allocated_bytes += tracemalloc.get_traced_memory()[1] - current_memory
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(traced_calls): op()
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(ops_per_second=ops_per_second, items_per_second=ops_per_second * batch_size,
+                allocated_bytes_per_op=allocated_bytes / traced_calls,
+                allocated_blocks_per_op=allocated_blocks / traced_calls,
+                peak_memory_bytes=peak_memory)
+
+
+def metadata():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'processor': platform.processor(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def compare_against_baseline(report, baseline, tolerance=0.1):
+    '''
+    Compares the throughput of every result in :param: report with the matching result in :param: baseline
+    :param report: output of run_benchmarks
+    :param baseline: previously saved output of run_benchmarks
+    :param tolerance: relative slowdown above which a result is considered a regression
+    :returns: list of comparisons, each a dictionary with the benchmark's key, both throughputs,
+              their 'speedup' ratio, and whether it is a 'regression'
+    '''
+    key = lambda result: (result['benchmark'], result['stacked_observations'], result['batch_size'])
+    baseline_results = {key(result): result for result in baseline['results']}
+    comparisons = []
+    for result in report['results']:
+        if key(result) not in baseline_results: continue
+        baseline_ops_per_second = baseline_results[key(result)]['ops_per_second']
+        speedup = result['ops_per_second'] / baseline_ops_per_second
+        comparisons.append(dict(benchmark=result['benchmark'], stacked_observations=result['stacked_observations'],
+                                batch_size=result['batch_size'], ops_per_second=result['ops_per_second'],
+                                baseline_ops_per_second=baseline_ops_per_second,
+                                speedup=speedup, regression=speedup < 1 - tolerance))
+    return comparisons
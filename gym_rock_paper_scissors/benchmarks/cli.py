@@ -0,0 +1,51 @@
+import sys
+import json
+import argparse
+
+from .benchmarks import BENCHMARKS, run_benchmarks, compare_against_baseline
+
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(description='Measures the throughput and memory usage of the Rock Paper Scissors environment and agents')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run. Default: all of them')
+    parser.add_argument('--stacked-observations', nargs='+', type=int, default=list(range(1, 11)),
+                        help='Values of stacked_observations to sweep. Default: 1 to 10')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 64, 4096],
+                        help='Batch sizes to sweep for batched benchmarks. Default: 1 64 4096')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Minimum number of seconds during which each operation is timed. Default: 0.2')
+    parser.add_argument('--seed', type=int, default=0, help='Seed used to generate benchmark inputs')
+    parser.add_argument('--output', help='Path of the JSON report. Printed to stdout if not given')
+    parser.add_argument('--baseline', help='Path of a previously saved JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Relative slowdown with respect to the baseline considered a regression. Default: 0.1')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    '''
+    Runs the benchmarks and writes their JSON report. When a baseline is given,
+    the comparison is added to the report under 'comparison', and the exit
+    status is 1 if any benchmark regressed by more than the tolerance
+    '''
+    arguments = parse_arguments(sys.argv[1:] if args is None else args)
+    report = run_benchmarks(benchmark_names=arguments.benchmarks, stacked_observations=arguments.stacked_observations,
+                            batch_sizes=arguments.batch_sizes, min_time=arguments.min_time, seed=arguments.seed)
+    regressions = []
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            report['comparison'] = compare_against_baseline(report, json.load(baseline_file), arguments.tolerance)
+        regressions = [comparison for comparison in report['comparison'] if comparison['regression']]
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for regression in regressions:
+        print('Regression in {benchmark} (stacked_observations={stacked_observations}, batch_size={batch_size}): '
+              '{speedup:.2f}x baseline throughput'.format(**regression), file=sys.stderr)
+    return 1 if regressions else 0
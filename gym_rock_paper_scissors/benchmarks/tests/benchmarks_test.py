@@ -0,0 +1,46 @@
+import json
+import numpy as np
+from .. import BENCHMARKS, run_benchmarks, compare_against_baseline
+from ..cli import main
+
+
+def test_every_benchmark_reports_throughput_and_memory_usage():
+    report = run_benchmarks(stacked_observations=[1, 2], batch_sizes=[1, 8], min_time=0.001)
+    assert {result['benchmark'] for result in report['results']} == set(BENCHMARKS)
+    for result in report['results']:
+        assert result['ops_per_second'] > 0
+        assert result['items_per_second'] == result['ops_per_second'] * result['batch_size']
+        assert result['peak_memory_bytes'] >= 0
+        assert result['batch_size'] == 1 or BENCHMARKS[result['benchmark']].batched
+        assert (result['stacked_observations'] is None) != BENCHMARKS[result['benchmark']].depends_on_recall
+    # Benchmarks which do not depend on stacked_observations run once per batch size
+    assert [result['batch_size'] for result in report['results'] if result['benchmark'] == 'sample_actions'] == [1, 8]
+
+
+def test_comparison_flags_regressions_beyond_tolerance():
+    baseline = {'results': [{'benchmark': 'env_step', 'stacked_observations': 3, 'batch_size': 1, 'ops_per_second': 100.}]}
+    report   = {'results': [{'benchmark': 'env_step', 'stacked_observations': 3, 'batch_size': 1, 'ops_per_second': 85.},
+                            {'benchmark': 'env_step', 'stacked_observations': 4, 'batch_size': 1, 'ops_per_second': 1.}]}
+    comparison, = compare_against_baseline(report, baseline, tolerance=0.1)
+    assert comparison['regression'] and comparison['speedup'] == 0.85
+    comparison, = compare_against_baseline(report, baseline, tolerance=0.2)
+    assert not comparison['regression']
+
+
+def test_cli_writes_json_report_and_fails_on_regressions(tmp_path):
+    arguments = ['--benchmarks', 'take_action', '--stacked-observations', '1', '--min-time', '0.001']
+    assert main(arguments + ['--output', str(tmp_path / 'baseline.json')]) == 0
+    baseline = json.loads((tmp_path / 'baseline.json').read_text())
+    assert len(baseline['results']) == 1
+
+    baseline['results'][0]['ops_per_second'] *= 1000
+    (tmp_path / 'baseline.json').write_text(json.dumps(baseline))
+    assert main(arguments + ['--output', str(tmp_path / 'report.json'), '--baseline', str(tmp_path / 'baseline.json')]) == 1
+    assert json.loads((tmp_path / 'report.json').read_text())['comparison'][0]['regression']
+
+
+def test_benchmarks_do_not_touch_global_random_state():
+    state = np.random.get_state()
+    run_benchmarks(benchmark_names=['env_step', 'hash_states'], stacked_observations=[1], batch_sizes=[8], min_time=0.001)
+    after = np.random.get_state()
+    assert state[0] == after[0] and np.array_equal(state[1], after[1]) and state[2:] == after[2:]
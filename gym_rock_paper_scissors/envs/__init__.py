@@ -1,2 +1,21 @@
-from gym_rock_paper_scissors.envs.rock_paper_scissors_env import RockPaperScissorsEnv
-from gym_rock_paper_scissors.envs.rock_paper_scissors_env import Action
+import importlib
+
+from gym_rock_paper_scissors.envs.engine import RockPaperScissorsEngine, Action
+from gym_rock_paper_scissors.envs.batched_engine import BatchedRockPaperScissorsEngine
+from gym_rock_paper_scissors.envs.tabular_mdp import TabularMDP, compile_tabular_mdp
+from gym_rock_paper_scissors.envs.payoff_tensors import pairwise_payoff_tensor, cyclic_payoff_tensor
+
+# Gym environments are imported, along with gym, the first time they are accessed
+GYM_ENVS = {'RockPaperScissorsEnv': 'gym_rock_paper_scissors.envs.rock_paper_scissors_env',
+            'BatchedRockPaperScissorsEnv': 'gym_rock_paper_scissors.envs.batched_rock_paper_scissors_env'}
+
+
+def __getattr__(name):
+    if name not in GYM_ENVS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = getattr(importlib.import_module(GYM_ENVS[name]), name)
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(list(globals()) + list(GYM_ENVS))
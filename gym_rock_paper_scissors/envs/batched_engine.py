@@ -0,0 +1,156 @@
+import numpy as np
+
+from .engine import RockPaperScissorsEngine
+from .tabular_mdp import DEFAULT_MEMORY_BUDGET
+
+
+class BatchedRockPaperScissorsEngine(RockPaperScissorsEngine):
+    '''
+    Vectorized version of RockPaperScissorsEngine which plays :param: num_envs
+    independent repeated games of Rock Paper Scissors in lockstep.
+    All games are held in contiguous arrays, so a single call to step
+    advances every game with a handful of NumPy operations.
+    Actions:            (num_envs, number_of_players) integer array, one action per player per game
+    Observations:       (num_envs, number_of_players) + shape of a single observation, which depends on the
+                        observation_mode as in RockPaperScissorsEngine. For instance, one hot encoded two player
+                        observations have shape (num_envs, 2, stacked_observations, encoding_size)
+    Reward function:    (num_envs, number_of_players) array, same payoffs as RockPaperScissorsEngine
+    Games which reach max_repetitions are automatically reset. The observation
+    returned on their last step is their terminal observation, and their next
+    step is played from the initial (empty) state.
+    '''
+
+    def __init__(self, num_envs=1, stacked_observations=3, max_repetitions=10,
+                 payoff_rock_vs_paper=-1, payoff_rock_vs_scissors=1,
+                 payoff_paper_vs_scissors=-1, payoff_matrix=None, observation_mode='one_hot',
+                 compiled=False, memory_budget=DEFAULT_MEMORY_BUDGET, number_of_players=None):
+        '''
+        :param num_envs: Number of games played in parallel
+        :param stacked_observations: Number of joint actions to be considered as part of the state
+        :param max_repetitions: Number of times each game will be played
+        :param payoff_matrix: Optional payoffs overriding the payoff_* parameters, see RockPaperScissorsEngine
+        :param observation_mode: Representation of the observations, see RockPaperScissorsEngine
+        :param compiled: Whether to precompute transitions, rewards and observations for every state
+        :param memory_budget: Maximum number of bytes of the compiled tables
+        :param number_of_players: Number of players, see RockPaperScissorsEngine
+        '''
+        if not isinstance(num_envs, int) or num_envs <= 0:
+            raise ValueError("Parameter num_envs should be an integer greater than 0")
+        self.num_envs = num_envs
+        super().__init__(stacked_observations=stacked_observations, max_repetitions=max_repetitions,
+                         payoff_rock_vs_paper=payoff_rock_vs_paper,
+                         payoff_rock_vs_scissors=payoff_rock_vs_scissors,
+                         payoff_paper_vs_scissors=payoff_paper_vs_scissors,
+                         payoff_matrix=payoff_matrix, observation_mode=observation_mode,
+                         compiled=compiled, memory_budget=memory_budget, number_of_players=number_of_players)
+
+        self.repetitions = np.zeros(self.num_envs, dtype=np.int64)
+
+    @property
+    def initial_state(self):
+        '''
+        States filled with empty actions for every game
+        '''
+        initial_s = np.zeros((self.num_envs, self.stacked_observations, self.encoding_size))
+        initial_s[:, :, -1] = 1
+        return initial_s
+
+    def initial_joint_action_buffer(self):
+        '''
+        Joint action buffers filled with empty actions for every game.
+        All games share the same buffer_head, as they are stepped in lockstep.
+        '''
+        return np.full((self.num_envs, self.stacked_observations), self.empty_action_index, dtype=np.int64)
+
+    def reset_state_hash(self):
+        '''
+        Recomputes the rolling state hash of every game from the joint action buffer
+        '''
+        joint_action_indices = self.joint_action_buffer[:, self.buffer_orderings[self.buffer_head]]
+        self.number_of_recalled_joint_actions = np.count_nonzero(joint_action_indices != self.empty_action_index, axis=-1)
+        self.state_hash = self.hash_joint_action_indices(joint_action_indices)
+        self.hash_value = self.state_hash - self.hash_offsets[self.number_of_recalled_joint_actions]
+
+    def clear_state_hash(self):
+        '''
+        Sets the rolling state hash of every game to the hash of the initial (empty) state
+        '''
+        self.hash_value = np.zeros(self.num_envs, dtype=np.int64)
+        self.number_of_recalled_joint_actions = np.zeros(self.num_envs, dtype=np.int64)
+        self.state_hash = np.zeros(self.num_envs, dtype=np.int64)
+
+    def step(self, action):
+        '''
+        Performs a step on every game in the batch
+        :param action: (num_envs, number_of_players) array containing an action for every player of every game
+        :returns: (observations, rewards, dones, info)
+        '''
+        action = np.asarray(action)
+        if action.shape != (self.num_envs, self.number_of_players):
+            raise ValueError("Parameter action should be an array of shape ({}, {}) containing an Action for each player of every game"
+                             .format(self.num_envs, self.number_of_players))
+        if np.any((action < 0) | (action >= self.action_space_size)):
+            raise ValueError("Every action in the action array should be an integer in [0, {})".format(self.action_space_size))
+
+        joint_action_index = self.encode_joint_actions(action)
+        self.transition_probability_function(joint_action_index)
+        reward           = self.joint_action_rewards[joint_action_index]
+        self.repetitions += 1
+        done = self.repetitions == self.max_repetitions
+        observations = self.observe()
+
+        info = {'state_hash': self.state_hash.copy()}
+        if done.any(): self.reset_games(done)
+        return observations, reward, done, info
+
+    def transition_probability_function(self, joint_action_index):
+        '''
+        Executes the joint actions with indices :param: joint_action_index in every game,
+        overwriting the oldest joint actions in the circular state buffer and updating the state hashes
+        :param joint_action_index: (num_envs,) array of indices of the joint actions in the one hot encoding
+        '''
+        if self.tabular_mdp is not None:
+            self.state_hash = self.tabular_mdp.next_states[self.state_hash, joint_action_index]
+            return
+        oldest_joint_action = self.joint_action_buffer[:, self.buffer_head]
+        forgotten = oldest_joint_action != self.empty_action_index
+        forgotten_value = np.where(forgotten, oldest_joint_action * self.hash_powers[self.number_of_recalled_joint_actions - 1], 0)
+        self.hash_value = (self.hash_value - forgotten_value) * self.joint_action_space_size + joint_action_index
+        self.number_of_recalled_joint_actions = self.number_of_recalled_joint_actions - forgotten + 1
+        self.state_hash = self.hash_value + self.hash_offsets[self.number_of_recalled_joint_actions]
+
+        self.joint_action_buffer[:, self.buffer_head] = joint_action_index
+        self.buffer_head = (self.buffer_head + 1) % self.stacked_observations
+
+    def observe(self):
+        '''
+        Replicates the current state of every game for every player into a single contiguous array
+        :returns: array of shape (num_envs, number_of_players) + shape of a single observation
+        '''
+        if self.observation_mode == 'state_hash':
+            return np.repeat(self.state_hash[:, np.newaxis], self.number_of_players, axis=1)
+        if self.tabular_mdp is not None:
+            return np.repeat(self.compiled_observation_table()[self.state_hash][:, np.newaxis], self.number_of_players, axis=1)
+        return super().observe()
+
+    def reset_games(self, games):
+        '''
+        Resets a subset of the games in the batch
+        :param games: boolean mask or indices of the games to reset
+        '''
+        self.repetitions[games] = 0
+        self.joint_action_buffer[games] = self.empty_action_index
+        self.hash_value[games] = 0
+        self.number_of_recalled_joint_actions[games] = 0
+        self.state_hash[games] = 0
+
+    def reset(self):
+        '''
+        Resets every game in the batch by emptying their state vectors
+        :returns: observations of every player of every game
+        '''
+        self.repetitions = np.zeros(self.num_envs, dtype=np.int64)
+        self.joint_action_buffer = self.initial_joint_action_buffer()
+        self.buffer_head = 0
+        self.clear_state_hash()
+        return self.observe()
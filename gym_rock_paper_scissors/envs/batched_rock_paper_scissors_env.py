@@ -0,0 +1,37 @@
+from functools import cached_property
+
+import numpy as np
+
+from gym.spaces import Box, MultiDiscrete
+from .rock_paper_scissors_env import RockPaperScissorsEnv
+from .batched_engine import BatchedRockPaperScissorsEngine
+
+
+class BatchedRockPaperScissorsEnv(BatchedRockPaperScissorsEngine, RockPaperScissorsEnv):
+    '''
+    Gym environment which plays :param: num_envs independent repeated games of Rock Paper Scissors
+    in lockstep, implemented and documented by BatchedRockPaperScissorsEngine.
+    Action space:       MultiDiscrete of shape (num_envs, number_of_players), one action per player per game
+    Observation space:  Box of shape (num_envs, number_of_players) + shape of a single observation,
+                        which depends on the observation_mode
+    Spaces are only built when they are first accessed, as in RockPaperScissorsEnv.
+    '''
+
+    @cached_property
+    def action_space(self):
+        return MultiDiscrete(np.full((self.num_envs, self.number_of_players), self.action_space_size))
+
+    @cached_property
+    def observation_space(self):
+        return self.batched_observation_space()
+
+    def batched_observation_space(self):
+        '''
+        Observation space of every player of every game, which depends on the observation_mode
+        '''
+        shape = (self.num_envs, self.number_of_players)
+        if self.observation_mode == 'joint_action_indices':
+            return Box(low=0, high=self.encoding_size - 1, shape=shape + (self.stacked_observations,), dtype=self.joint_action_index_dtype)
+        if self.observation_mode == 'state_hash':
+            return Box(low=0, high=self.state_space_size - 1, shape=shape, dtype=np.int64)
+        return Box(low=0, high=1, shape=shape + (self.stacked_observations, self.encoding_size), dtype=np.float64)
@@ -0,0 +1,487 @@
+from enum import Enum
+
+import numpy as np
+
+from .tabular_mdp import compile_tabular_mdp, DEFAULT_MEMORY_BUDGET
+from .payoff_tensors import pairwise_payoff_tensor
+
+
+class Action(Enum):
+    ROCK     = 0
+    PAPER    = 1
+    SCISSORS = 2
+
+
+OBSERVATION_MODES = ('one_hot', 'joint_action_indices', 'state_hash')
+
+# Attributes derived from the payoffs and stacked_observations, which are shared
+# by every engine with the same configuration (see RockPaperScissorsEngine.__init__)
+CONFIGURATION_ATTRIBUTES = ('payoff_tensor', 'number_of_players', 'action_space_size', 'valid_actions',
+                            'joint_action_space_size', 'joint_action_radices', 'joint_action_rewards',
+                            'decoded_joint_actions', 'encoding_size', 'joint_action_index_dtype', 'state_space_size',
+                            'empty_action_index', 'one_hot_table', 'buffer_orderings', 'observation_orderings',
+                            'hash_powers', 'hash_offsets')
+CONFIGURATION_METHODS = ('derive_configuration', 'compile_payoff_tensor', 'calculate_state_space_size')
+configurations = {}  # Cache of configuration attributes indexed by the constructor parameters which determine them
+
+
+class RockPaperScissorsEngine():
+    '''
+    Repeated game of Rock Paper scissors with imperfect recall, implemented without depending on gym.
+    RockPaperScissorsEnv adds gym's interface on top of it, the engine can be used directly by
+    processes which neither need gym's spaces nor want to pay for importing gym
+    Action space:       [ROCK, PAPER, SCISSORS] for each player. Any number of actions
+                        and players can be used by giving a payoff tensor (see payoff_tensors.py)
+    State space:        Previous _n_ moves by all players, where _n_ is parameterized as "stacked_observations" in the constructor
+    Observation space:  The environment's true state is replicated for every player.
+                        Every player gets its individual and identical observation. This redundancy
+                        is introduced to present the same interface as Gym envs with partial observability.
+                        Depending on "observation_mode" each observation is either:
+                            - 'one_hot': stacked_observations one hot encoded joint actions (default)
+                            - 'joint_action_indices': int8 array with the index of each stacked joint action
+                              (or the smallest signed integer type that fits every joint action index)
+                            - 'state_hash': the hash of the state (see hash_state), in [0, state_space_size)
+    Joint actions:      A joint action (a1, ..., an) is encoded as the mixed radix number with digits a1, ..., an
+                        in base action_space_size, a1 being the most significant digit. For two players
+                        with three actions, the joint action index is 3 * a1 + a2
+    Reward function:    -1/+1 for losing / winning a single round, looked up in env.payoff_tensor
+    Compiled mode:      When "compiled" is set, the dynamics over the full hashed state space are precomputed
+                        once per configuration (see compile_tabular_mdp), and every step becomes a few table lookups.
+                        The compiled tables are available as env.tabular_mdp
+    Info:               'state_hash' contains the hash of the new state (see hash_state),
+                        maintained incrementally on every step. Also available as env.state_hash
+    '''
+
+    def __init__(self, stacked_observations=3, max_repetitions=10,
+                 payoff_rock_vs_paper=-1, payoff_rock_vs_scissors=1,
+                 payoff_paper_vs_scissors=-1, payoff_matrix=None, observation_mode='one_hot',
+                 compiled=False, memory_budget=DEFAULT_MEMORY_BUDGET, number_of_players=None):
+        '''
+        :param stacked_observations: Number of joint actions to be considered as part of the state
+        :param max_repetitions: Number of times the game will be played
+        :param payoff_matrix: Optional payoffs overriding the payoff_* parameters, either a square matrix
+                              with the payoffs of the first player of a two player zero sum game, or a tensor
+                              of shape (number_of_actions,) * number_of_players + (number_of_players,)
+                              where payoff_matrix[a1, ..., an] contains the reward of each player for actions a1, ..., an
+        :param observation_mode: Representation of the observations, one of 'one_hot', 'joint_action_indices', 'state_hash'
+        :param compiled: Whether to precompute transitions, rewards and observations for every state
+        :param memory_budget: Maximum number of bytes of the compiled tables
+        :param number_of_players: Number of players. Defaults to the number of players of :param: payoff_matrix, or 2.
+                                  Without a payoff_matrix, every player plays Rock Paper Scissors with the payoff_*
+                                  parameters against each of the other players
+        :throws ValueError: If compiled is set and the compiled tables would exceed memory_budget
+        '''
+        if not isinstance(stacked_observations, int) or stacked_observations <= 0:
+            raise ValueError("Parameter stacked_observations should be an integer greater than 0")
+        if observation_mode not in OBSERVATION_MODES:
+            raise ValueError("Parameter observation_mode should be one of {}. Given: {}".format(OBSERVATION_MODES, observation_mode))
+        if number_of_players is not None and (not isinstance(number_of_players, int) or number_of_players <= 0):
+            raise ValueError("Parameter number_of_players should be an integer greater than 0")
+
+        self.payoff_rock_vs_paper = payoff_rock_vs_paper
+        self.payoff_rock_vs_scissors = payoff_rock_vs_scissors
+        self.payoff_paper_vs_scissors = payoff_paper_vs_scissors
+        self.stacked_observations = stacked_observations
+        self.observation_mode     = observation_mode
+        self.repetition = 0
+        self.max_repetitions = max_repetitions
+
+        # Every constant derived from the payoffs and stacked_observations is computed
+        # once per configuration, and shared (read only) by every engine with that configuration.
+        # The methods deriving them are part of the key, so that subclasses overriding them do not get the cached constants
+        derivation = tuple(getattr(type(self), method) for method in CONFIGURATION_METHODS)
+        if payoff_matrix is None:
+            key = (derivation, stacked_observations, number_of_players, payoff_rock_vs_paper, payoff_rock_vs_scissors, payoff_paper_vs_scissors)
+        else:
+            payoff_matrix = np.asarray(payoff_matrix, dtype=np.float64)
+            key = (derivation, stacked_observations, number_of_players, payoff_matrix.shape, payoff_matrix.tobytes())
+        if key not in configurations:
+            self.derive_configuration(payoff_matrix, number_of_players)
+            configurations[key] = {attribute: getattr(self, attribute) for attribute in CONFIGURATION_ATTRIBUTES}
+        self.__dict__.update(configurations[key])
+
+        self.joint_action_buffer = self.initial_joint_action_buffer()
+        self.buffer_head         = 0
+        self.tabular_mdp = compile_tabular_mdp(self, memory_budget) if compiled else None
+        self.clear_state_hash()
+
+    def derive_configuration(self, payoff_matrix, number_of_players):
+        '''
+        Computes every attribute in CONFIGURATION_ATTRIBUTES
+        '''
+        # Payoffs, from which the number of players and actions are derived
+        self.payoff_tensor = self.compile_payoff_tensor(payoff_matrix, number_of_players)
+
+        self.number_of_players    = self.payoff_tensor.ndim - 1
+        self.action_space_size    = self.payoff_tensor.shape[0]
+        self.valid_actions        = range(self.action_space_size)
+
+        # Joint actions are encoded as mixed radix numbers, with one digit per player
+        self.joint_action_space_size = self.action_space_size**self.number_of_players
+        self.joint_action_radices    = self.action_space_size ** np.arange(self.number_of_players - 1, -1, -1, dtype=np.int64)
+        self.joint_action_rewards    = self.payoff_tensor.reshape(self.joint_action_space_size, self.number_of_players)
+        self.decoded_joint_actions   = tuple(tuple(Action(a) if self.action_space_size == len(Action) else a for a in joint_action)
+                                             for joint_action in np.ndindex(*self.payoff_tensor.shape[:-1]))
+
+        self.encoding_size = self.joint_action_space_size + 1 # all possible action combinations + empty action
+        self.joint_action_index_dtype = np.min_scalar_type(-self.encoding_size) # int8 for up to 127 joint actions
+        self.state_space_size  = self.calculate_state_space_size(self.stacked_observations, self.action_space_size)
+        if self.state_space_size > np.iinfo(np.int64).max:
+            raise ValueError("The state space of {} joint actions with stacked_observations={} is too large to be hashed into 64 bit integers"
+                             .format(self.joint_action_space_size, self.stacked_observations))
+
+        # The state is stored as a circular buffer of joint action indices, where
+        # buffer_head points at the oldest joint action. One hot encoded states are
+        # only materialised, through one_hot_table, when they are observed.
+        self.empty_action_index = self.encoding_size - 1
+        self.one_hot_table      = np.eye(self.encoding_size)
+        self.buffer_orderings   = (np.arange(self.stacked_observations)[:, np.newaxis] + np.arange(self.stacked_observations)) % self.stacked_observations
+        self.observation_orderings = np.repeat(self.buffer_orderings[:, np.newaxis], self.number_of_players, axis=1)
+
+        # The hash of the current state is maintained as a rolling value in
+        # transition_probability_function: hash_value is the (joint_action_space_size)ary
+        # number formed by the recalled (non empty) joint actions, to which the
+        # offset for the number of recalled joint actions is added.
+        self.hash_powers  = self.joint_action_space_size ** np.arange(self.stacked_observations + 1, dtype=np.int64)
+        self.hash_offsets = np.cumsum(np.concatenate([[0], self.hash_powers[:-1]]))
+
+        for table in [self.joint_action_radices, self.one_hot_table, self.buffer_orderings,
+                      self.observation_orderings, self.hash_powers, self.hash_offsets]:
+            table.flags.writeable = False
+
+    def compile_payoff_tensor(self, payoff_matrix=None, number_of_players=None):
+        '''
+        Compiles the payoffs of the game into a read only tensor, so that rewards
+        can be computed with a single index lookup
+        :param payoff_matrix: square zero sum payoff matrix of a two player game or payoff tensor. If None, it
+                              is built from the payoff_* parameters given in the constructor
+        :param number_of_players: Expected number of players, see constructor
+        :throws ValueError: If :param: payoff_matrix does not have a valid shape
+        :returns: tensor of shape (number_of_actions,) * number_of_players + (number_of_players,),
+                  where payoff_tensor[a1, ..., an] contains the reward of each player
+        '''
+        if payoff_matrix is None:
+            r_p, r_s, p_s = self.payoff_rock_vs_paper, self.payoff_rock_vs_scissors, self.payoff_paper_vs_scissors
+            pairwise_payoffs = [[0,    r_p,  r_s],
+                                [-r_p, 0,    p_s],
+                                [-r_s, -p_s, 0]]
+            payoff_matrix = pairwise_payoff_tensor(pairwise_payoffs, 2 if number_of_players is None else number_of_players)
+        payoff_matrix = np.array(payoff_matrix, dtype=np.float64)
+        if payoff_matrix.ndim == 2 and payoff_matrix.shape[0] == payoff_matrix.shape[1] and number_of_players in (None, 2):
+            payoff_matrix = np.stack([payoff_matrix, -payoff_matrix], axis=-1)
+        players = payoff_matrix.ndim - 1
+        if players < 1 or payoff_matrix.shape != (payoff_matrix.shape[0],) * players + (players,) or \
+           number_of_players not in (None, players) or payoff_matrix.shape[0] == 0:
+            raise ValueError("Parameter payoff_matrix should have shape (A, A) or (A,) * number_of_players + (number_of_players,), "
+                             "for some number of actions A{}. Given shape: {}"
+                             .format('' if number_of_players is None else ' and number_of_players={}'.format(number_of_players), payoff_matrix.shape))
+        payoff_matrix.flags.writeable = False
+        return payoff_matrix
+
+    @property
+    def initial_state(self):
+        '''
+        State filled with empty actions
+        '''
+        initial_s     = np.zeros(self.encoding_size)
+        initial_s[-1] = 1
+        return [initial_s for _ in range(self.stacked_observations)]
+
+    def initial_joint_action_buffer(self):
+        '''
+        Joint action buffer filled with empty actions
+        '''
+        return np.full(self.stacked_observations, self.empty_action_index, dtype=np.int64)
+
+    @property
+    def joint_action_indices(self):
+        '''
+        Joint action indices stored in the state, ordered from oldest to newest
+        '''
+        if self.tabular_mdp is not None: return self.tabular_mdp.joint_action_indices[self.state_hash].astype(np.int64)
+        return self.joint_action_buffer[..., self.buffer_orderings[self.buffer_head]]
+
+    @property
+    def state(self):
+        '''
+        One hot encoded state, freshly materialised from the joint action buffer
+        '''
+        return self.one_hot_table[self.joint_action_indices]
+
+    @state.setter
+    def state(self, state):
+        self.joint_action_buffer = np.argmax(np.asarray(state), axis=-1)
+        self.buffer_head = 0
+        self.reset_state_hash()
+
+    def reset_state_hash(self):
+        '''
+        Recomputes the rolling state hash from the joint action buffer
+        '''
+        joint_action_indices = self.joint_action_buffer[self.buffer_orderings[self.buffer_head]]
+        self.number_of_recalled_joint_actions = int(np.count_nonzero(joint_action_indices != self.empty_action_index))
+        self.state_hash = int(self.hash_joint_action_indices(joint_action_indices))
+        self.hash_value = self.state_hash - self.hash_offsets.item(self.number_of_recalled_joint_actions)
+
+    def clear_state_hash(self):
+        '''
+        Sets the rolling state hash to the hash of the initial (empty) state, which is always 0
+        '''
+        self.hash_value = self.number_of_recalled_joint_actions = self.state_hash = 0
+
+    def observe(self):
+        '''
+        Replicates the current state for every player into a single contiguous
+        array, which does not share memory with the environment's internal state
+        :returns: array of shape (number_of_players,) + shape of a single observation,
+                  which is (stacked_observations, encoding_size) for 'one_hot' observations,
+                  (stacked_observations,) for 'joint_action_indices' and () for 'state_hash'
+        '''
+        if self.observation_mode == 'state_hash':
+            return np.full(self.number_of_players, self.state_hash, dtype=np.int64)
+        if self.tabular_mdp is not None:
+            return np.repeat(self.compiled_observation_table()[self.state_hash][np.newaxis], self.number_of_players, axis=0)
+        return self.encode_observations(self.joint_action_buffer[..., self.observation_orderings[self.buffer_head]])
+
+    def encode_observations(self, joint_action_indices, observation_mode=None):
+        '''
+        Builds observations from states represented by their joint action indices
+        :param joint_action_indices: integer array of shape (..., stacked_observations), ordered from oldest to newest
+        :param observation_mode: one of OBSERVATION_MODES, defaults to the env's observation_mode
+        :returns: array of shape (..., stacked_observations, encoding_size) for 'one_hot' observations,
+                  (..., stacked_observations) for 'joint_action_indices' and (...) for 'state_hash'
+        '''
+        observation_mode = self.observation_mode if observation_mode is None else observation_mode
+        if observation_mode == 'joint_action_indices': return joint_action_indices.astype(self.joint_action_index_dtype)
+        if observation_mode == 'state_hash': return self.hash_joint_action_indices(joint_action_indices)
+        return self.one_hot_table[joint_action_indices]
+
+    def compiled_observation_table(self):
+        '''
+        Table of the compiled tabular_mdp which maps state hashes to observations in the env's observation_mode
+        '''
+        if self.observation_mode == 'joint_action_indices': return self.tabular_mdp.joint_action_indices
+        return self.tabular_mdp.observations
+
+    def calculate_state_space_size(self, stacked_observations, number_of_actions, number_of_players=None):
+        """
+        Computes the total number of possible states for an input memory size given a number of inputs
+        for a game of number_of_players players. This is done by creating a (n)ary numerical system, where n
+        is the input number of actions and computing the maximum possible value given a number of digits
+        equal to number_of_players*stacked_observations, for every amount of joint actions recalled
+        :param stacked_observations: memory buffer length, amount of recall, number of joint actions stored in memory
+        :param number_of_actions: number of actions that each player can take
+        :param number_of_players: number of players, defaults to the env's number of players
+        """
+        number_of_players = self.number_of_players if number_of_players is None else number_of_players
+        return sum([(number_of_actions**number_of_players)**memory_size for memory_size in range(0, stacked_observations + 1)])
+
+    def hash_state(self, state, number_of_actions=None):
+        """
+        Hashes the input state into a decimal bounded by [0, state_space_size).
+        This is done by changing the state to a (n)ary numerical system and
+        offseting for all the states that have some empty values. As joint actions
+        are mixed radix numbers, the digits of the (n)ary number are the joint action indices.
+        :param state: state to hash into a 0-index decimal, in any of the observation modes
+        :param number_of_actions: number of actions that each player can take. Derived from the payoff tensor,
+                                  kept for backwards compatibility
+        :returns: integer hashed representaiton of the environments state
+        """
+        if np.ndim(state) == 0: return int(state) # Already hashed
+        if np.ndim(state) == 1: return int(self.hash_joint_action_indices(state))
+        return int(self.hash_joint_action_indices([partial_state.tolist().index(1) for partial_state in state]))
+
+    def hash_states(self, states):
+        '''
+        Vectorized version of hash_state for a batch of states
+        :param states: array of one hot encoded states of shape (..., stacked_observations, encoding_size)
+        :returns: array of shape (...) containing the hashed representation of each state
+        '''
+        return self.hash_joint_action_indices(np.argmax(np.asarray(states), axis=-1))
+
+    def hash_joint_action_indices(self, joint_action_indices):
+        '''
+        Hashes states represented by their joint action indices, ordered from oldest to newest.
+        Produces the same values as hash_state, empty joint actions are ignored wherever they are.
+        :param joint_action_indices: integer array of shape (..., stacked_observations)
+        :returns: array of shape (...) containing the hashed representation of each state
+        '''
+        joint_action_indices = np.asarray(joint_action_indices)
+        recalled = joint_action_indices != self.empty_action_index
+        later_recalled = np.cumsum(recalled[..., ::-1], axis=-1)[..., ::-1] - recalled
+        digits = np.where(recalled, joint_action_indices, 0)
+        return (digits * self.hash_powers[later_recalled]).sum(axis=-1) + self.hash_offsets[recalled.sum(axis=-1)]
+
+    def unhash_states(self, state_hashes):
+        '''
+        Inverse of hash_joint_action_indices. Empty joint actions are placed
+        before the recalled ones, as they are in the environment's state.
+        :param state_hashes: integer or array of integers in [0, state_space_size)
+        :returns: integer array of shape (..., stacked_observations) containing the
+                  joint action indices of each state, ordered from oldest to newest
+        '''
+        state_hashes = np.asarray(state_hashes)
+        number_of_recalled_joint_actions = np.searchsorted(self.hash_offsets, state_hashes, side='right') - 1
+        hash_values = state_hashes - self.hash_offsets[number_of_recalled_joint_actions]
+        exponents   = np.arange(self.stacked_observations)[::-1]
+        digits = (hash_values[..., np.newaxis] // self.hash_powers[exponents]) % self.joint_action_space_size
+        return np.where(exponents < number_of_recalled_joint_actions[..., np.newaxis], digits, self.empty_action_index)
+
+    def calculate_hash_offset(self, state, number_of_actions):
+        """
+        Given a state, it calculates how many possible states there are
+        that contain an empty action. Used to offset the overall hash.
+        :param state: state to hash into a 0-index decimal
+        :param number_of_actions: number of actions that each player can take
+        :returns: offset for final hashed value
+        """
+        number_of_empty_actions = len(list(filter(lambda x: x is None, state)))
+        number_of_offsets_to_compensate = len(state) - number_of_empty_actions
+        offset = sum([(number_of_actions**self.number_of_players)**i for i in range(0, number_of_offsets_to_compensate)])
+        return offset
+
+    def step(self, action):
+        '''
+        Performs a step of the reinforcement learning loop by executing the action, changing the environment's state,
+        computing the reward for all agents, and detecting if the environment has reached a terminal state
+        :param action: vector containing an action for every player
+        :returns: (observations, reward, done, info)
+        '''
+        if len(action) != self.number_of_players:
+            raise ValueError("Parameter action should be a vector of length {} containing an Action for each player".format(self.number_of_players))
+        if any(map(lambda a: a not in self.valid_actions, action)):
+            raise ValueError("Every action in the action vector should be an integer in [0, {})".format(self.action_space_size))
+
+        joint_action_index = self.encode_joint_action(action)
+        self.transition_probability_function(joint_action_index)
+        reward           = self.joint_action_rewards[joint_action_index].tolist()
+        self.repetition += 1
+        info = {'state_hash': self.state_hash}
+        done = self.repetition == self.max_repetitions
+        return self.observe(), reward, done, info
+
+    def transition_probability_function(self, joint_action_index):
+        '''
+        Executes the joint action with index :param: joint_action_index in the current state,
+        overwriting the oldest joint action in the circular state buffer and updating the state hash
+        :param joint_action_index: index of the joint action in the one hot encoding
+        '''
+        if self.tabular_mdp is not None:
+            self.state_hash = self.tabular_mdp.next_states.item(self.state_hash, joint_action_index)
+            return
+        oldest_joint_action = self.joint_action_buffer.item(self.buffer_head)
+        if oldest_joint_action != self.empty_action_index:
+            self.hash_value -= oldest_joint_action * self.hash_powers.item(self.number_of_recalled_joint_actions - 1)
+            self.number_of_recalled_joint_actions -= 1
+        self.hash_value = self.hash_value * self.joint_action_space_size + joint_action_index
+        self.number_of_recalled_joint_actions += 1
+        self.state_hash = self.hash_value + self.hash_offsets.item(self.number_of_recalled_joint_actions)
+
+        self.joint_action_buffer[self.buffer_head] = joint_action_index
+        self.buffer_head = (self.buffer_head + 1) % self.stacked_observations
+
+    def encode_joint_action(self, joint_action):
+        '''
+        Computes the index of :param: joint_action in the one hot encoding
+        :param joint_action: vector containing an integer action for each player
+        :returns: integer mixed radix joint action index
+        '''
+        joint_action_index = 0
+        for action in joint_action:
+            joint_action_index = joint_action_index * self.action_space_size + int(action)
+        return joint_action_index
+
+    def encode_joint_actions(self, joint_actions):
+        '''
+        Vectorized version of encode_joint_action
+        :param joint_actions: integer array of shape (..., number_of_players)
+        :returns: integer array of shape (...) of joint action indices
+        '''
+        return np.asarray(joint_actions, dtype=np.int64) @ self.joint_action_radices
+
+    def transition_state_hashes(self, state_hashes, joint_action_indices):
+        '''
+        Vectorized transition function over state hashes, which neither reads nor modifies the env's current state.
+        The oldest recalled joint action is the most significant digit of a state hash, so it is dropped from
+        full states with a modulo, before appending the new joint action as the least significant digit.
+        :param state_hashes: integer array of state hashes
+        :param joint_action_indices: integer array of joint action indices, broadcastable with :param: state_hashes
+        :returns: integer array containing the hash of the state reached by each joint action
+        '''
+        if self.tabular_mdp is not None: return self.tabular_mdp.next_states[state_hashes, joint_action_indices]
+        state_hashes = np.asarray(state_hashes, dtype=np.int64)
+        number_of_recalled_joint_actions = np.searchsorted(self.hash_offsets, state_hashes, side='right') - 1
+        hash_values = state_hashes - self.hash_offsets[number_of_recalled_joint_actions]
+        full_states = number_of_recalled_joint_actions == self.stacked_observations
+        hash_values = np.where(full_states, hash_values % self.hash_powers[-2], hash_values)
+        hash_values = hash_values * self.joint_action_space_size + joint_action_indices
+        return hash_values + self.hash_offsets[number_of_recalled_joint_actions - full_states + 1]
+
+    def one_hot_encode_action_into_state(self, joint_action):
+        '''
+        Transform :param: joint_action into a partial state which is one hot encoded
+        :param joint_action: array containing the latest actions for each player, as Actions or integers
+        :returns: one hot encoded state representation
+        '''
+        index = self.encode_joint_action(a.value if isinstance(a, Action) else a for a in joint_action)
+        return self.one_hot_table[index].copy()
+
+    def decode_state(self, state):
+        '''
+        Decodes a state, in any of the observation modes, into its list of joint actions
+        :param state: one hot encoded state, joint action indices or state hash
+        :returns: list containing a joint action, or None for empty actions, from oldest to newest
+        '''
+        if np.ndim(state) == 0: state = self.unhash_states(state)
+        if np.ndim(state) == 1: return [self.decode_joint_action_index(int(index)) for index in state]
+        return [self.decode_partial_state(partial_state) for partial_state in state]
+
+    def decode_partial_state(self, partial_state):
+        '''
+        decodes a one hot encoded state into a joint action
+        :param state: one hot encoded partial state
+        :returns: action
+        '''
+        return self.decode_joint_action_index(partial_state.tolist().index(1))
+
+    def decode_joint_action_index(self, joint_action_index):
+        '''
+        decodes the index of a joint action in the one hot encoding into a joint action
+        :param joint_action_index: index of the joint action
+        :returns: list containing the action of each player, as Actions for games with
+                  three actions and as integers otherwise. None for the empty joint action
+        '''
+        if joint_action_index == self.empty_action_index: return None # Empty state
+        return list(self.decoded_joint_actions[joint_action_index])
+
+    def reward_function(self, action):
+        '''
+        Reward function for the game of rock paper scissors, which looks up
+        the payoffs of :param: action in the payoff tensor. By default rock beats scissor,
+        scissors beat paper, paper beats rock. If both player take the same action,
+        they both get zero reward.
+        :param action: action vector containing action for every player, as Actions or integers
+        :returns: reward vector cotanining reward for each agent
+        '''
+        if any(map(lambda a: a is None, action)):
+            raise ValueError("One of the player actions was empty")
+        return self.payoff_tensor[tuple(a.value if isinstance(a, Action) else a for a in action)].tolist()
+
+    def rewards(self, joint_actions):
+        '''
+        Vectorized version of reward_function
+        :param joint_actions: integer array of shape (..., number_of_players) containing an action for every player
+        :returns: array of shape (..., number_of_players) containing the reward for each agent
+        '''
+        return self.joint_action_rewards[self.encode_joint_actions(joint_actions)]
+
+    def reset(self):
+        '''
+        Resets state by emptying the state vector
+        :returns: state observation for each player
+        '''
+        self.repetition = 0
+        self.joint_action_buffer = self.initial_joint_action_buffer()
+        self.buffer_head = 0
+        self.clear_state_hash()
+        return self.observe()
@@ -9,26 +9,50 @@ class OneHotEncoding(gym.Space):
     Example usage:
     self.observation_space = OneHotEncoding(size=4)
     """
-    def __init__(self, size=None):
+    def __init__(self, size=None, dtype=np.float64):
         assert isinstance(size, int) and size > 0
         self.size = size
-        gym.Space.__init__(self, (), np.int64)
+        gym.Space.__init__(self, (self.size,), dtype)
+        self.identity = np.eye(self.size, dtype=self.dtype)
+        self.identity.flags.writeable = False
 
-    def sample(self):
-        one_hot_vector = np.zeros(self.size)
-        one_hot_vector[np.random.randint(self.size)] = 1
-        return one_hot_vector
+    def sample(self, n=None):
+        '''
+        :param n: Number of one hot vectors to sample. If None, a single vector is sampled
+        :returns: array of shape (size,), or (n, size) if :param: n is given
+        '''
+        if n is None: return self.identity[self.random_indices()].copy()
+        return self.identity[self.random_indices(n)]
+
+    def random_indices(self, n=None):
+        '''
+        Samples indices in [0, size) from the space's np_random, which is a np.random.Generator
+        in recent gym releases and a np.random.RandomState in older ones
+        '''
+        np_random = self.np_random
+        if isinstance(np_random, np.random.Generator): return np_random.integers(self.size, size=n)
+        return np_random.randint(self.size, size=n)
 
     def contains(self, x):
         if isinstance(x, (list, tuple, np.ndarray)):
-            number_of_zeros = list(x).contains(0)
-            number_of_ones = list(x).contains(1)
-            return (number_of_zeros == (self.size - 1)) and (number_of_ones == 1)
+            x = np.asarray(x)
+            return x.shape == self.shape and np.count_nonzero(x == 1) == 1 and np.count_nonzero(x) == 1
         else:
             return False
 
+    def contains_batch(self, xs):
+        '''
+        Vectorized version of contains
+        :param xs: array of shape (..., size)
+        :returns: boolean array of shape (...), True where the vector is a valid one hot encoding
+        '''
+        xs = np.asarray(xs)
+        if xs.ndim == 0 or xs.shape[-1] != self.size:
+            return np.zeros(xs.shape[:-1], dtype=bool)
+        return (np.count_nonzero(xs == 1, axis=-1) == 1) & (np.count_nonzero(xs, axis=-1) == 1)
+
     def __repr__(self):
         return "OneHotEncoding(%d)" % self.size
 
     def __eq__(self, other):
-        return self.size == other.size
+        return isinstance(other, OneHotEncoding) and self.size == other.size and self.dtype == other.dtype
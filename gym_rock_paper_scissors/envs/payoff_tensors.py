@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def pairwise_payoff_tensor(pairwise_payoffs, number_of_players=2):
+    '''
+    Builds the payoff tensor of a game where every player plays a two player game
+    against each of the other players, and is rewarded with the sum of its payoffs
+    :param pairwise_payoffs: (number_of_actions, number_of_actions) matrix, where pairwise_payoffs[a, b]
+                             is the payoff of playing action a against an opponent playing action b
+    :param number_of_players: Number of players taking part in the game
+    :returns: tensor of shape (number_of_actions,) * number_of_players + (number_of_players,),
+              where payoff_tensor[a1, ..., an] contains the reward of each player
+    '''
+    pairwise_payoffs = np.asarray(pairwise_payoffs, dtype=np.float64)
+    number_of_actions = len(pairwise_payoffs)
+    joint_actions = np.indices((number_of_actions,) * number_of_players)
+    payoff_tensor = np.zeros((number_of_actions,) * number_of_players + (number_of_players,))
+    for player in range(number_of_players):
+        for opponent in range(number_of_players):
+            if player != opponent:
+                payoff_tensor[..., player] += pairwise_payoffs[joint_actions[player], joint_actions[opponent]]
+    return payoff_tensor
+
+
+def cyclic_payoff_tensor(number_of_actions=3, number_of_players=2):
+    '''
+    Payoff tensor of the generalisation of Rock Paper Scissors to an odd number of actions,
+    where action a beats action b if (a - b) mod number_of_actions is odd. Each player gets +1 for
+    every opponent it beats and -1 for every opponent that beats it. With 3 actions this is
+    Rock Paper Scissors, and with 5 actions ordered as [ROCK, PAPER, SCISSORS, SPOCK, LIZARD]
+    it is Rock Paper Scissors Lizard Spock
+    :param number_of_actions: Odd number of actions that each player can take
+    :param number_of_players: Number of players taking part in the game
+    :throws ValueError: If :param: number_of_actions is not odd, as the game would not be balanced
+    :returns: tensor of shape (number_of_actions,) * number_of_players + (number_of_players,)
+    '''
+    if not isinstance(number_of_actions, int) or number_of_actions < 1 or number_of_actions % 2 == 0:
+        raise ValueError("Parameter number_of_actions should be an odd positive integer. Given: {}".format(number_of_actions))
+    differences = (np.arange(number_of_actions)[:, np.newaxis] - np.arange(number_of_actions)) % number_of_actions
+    pairwise_payoffs = np.where(differences == 0, 0, np.where(differences % 2 == 1, 1, -1))
+    return pairwise_payoff_tensor(pairwise_payoffs, number_of_players)
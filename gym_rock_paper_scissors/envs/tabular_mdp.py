@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+DEFAULT_MEMORY_BUDGET = 256 * 2**20  # Bytes
+
+
+TabularMDP = namedtuple('TabularMDP', ['next_states', 'rewards', 'observations', 'joint_action_indices'])
+TabularMDP.__doc__ = '''
+Dynamics of a RockPaperScissorsEnv compiled over its full hashed state space. States are
+state hashes (see RockPaperScissorsEnv.hash_state), the initial state is 0, and actions are
+joint action indices (see RockPaperScissorsEnv.encode_joint_action), e.g. joint action (a1, a2)
+of a two player game with three actions has index 3 * a1 + a2.
+    - next_states:          (state_space_size, joint_action_space_size) integer array, next_states[s, a] is the state reached by taking a in s
+    - rewards:              (joint_action_space_size, number_of_players) array, rewards[a] contains the reward of each player for joint action a in any state
+    - observations:         (state_space_size, stacked_observations, encoding_size) one hot encoded state of each state hash
+    - joint_action_indices: (state_space_size, stacked_observations) joint action indices of each state hash,
+                            in the env's joint_action_index_dtype (int8 unless there are more than 127 joint actions)
+All arrays are read only, as they are shared between every environment with the same configuration.
+'''
+
+
+# Cache of TabularMDPs indexed by (stacked_observations, payoff_tensor shape, payoff_tensor bytes).
+# Entries are kept for the life of the process
+compiled_tabular_mdps = {}
+
+
+def tabular_mdp_size(env):
+    '''
+    Number of bytes needed to compile the TabularMDP of :param: env,
+    including the intermediate arrays used to build it
+    '''
+    number_of_joint_actions = env.encoding_size - 1
+    next_states  = env.state_space_size * number_of_joint_actions * 8
+    observations = env.state_space_size * env.stacked_observations * env.encoding_size * 8
+    joint_action_indices = env.state_space_size * env.stacked_observations * env.joint_action_index_dtype.itemsize
+    intermediate_successors = env.state_space_size * number_of_joint_actions * env.stacked_observations * 8
+    return next_states + observations + joint_action_indices + intermediate_successors
+
+
+def compile_tabular_mdp(env, memory_budget=DEFAULT_MEMORY_BUDGET):
+    '''
+    Builds, or retrieves from the cache, the TabularMDP for the stacked_observations and payoffs of :param: env
+    :param env: RockPaperScissorsEnv whose dynamics are compiled
+    :param memory_budget: Maximum number of bytes that the compiled tables are allowed to use
+    :throws ValueError: If the tables would exceed :param: memory_budget
+    :returns: TabularMDP
+    '''
+    # The budget is checked even for cached tables, so that the result does not depend on what was compiled before
+    required_memory = tabular_mdp_size(env)
+    if required_memory > memory_budget:
+        raise ValueError("Compiling the tabular MDP for stacked_observations={} requires {:.1f}MB, which exceeds the memory budget of {:.1f}MB"
+                         .format(env.stacked_observations, required_memory / 2**20, memory_budget / 2**20))
+    key = (env.stacked_observations, env.payoff_tensor.shape, env.payoff_tensor.tobytes())
+    if key in compiled_tabular_mdps: return compiled_tabular_mdps[key]
+
+    number_of_joint_actions = env.joint_action_space_size
+    joint_action_indices = env.unhash_states(np.arange(env.state_space_size))
+    # Every successor drops the oldest joint action of its state and appends a new one
+    successors = np.empty((env.state_space_size, number_of_joint_actions, env.stacked_observations), dtype=np.int64)
+    successors[:, :, :-1] = joint_action_indices[:, np.newaxis, 1:]
+    successors[:, :, -1]  = np.arange(number_of_joint_actions)
+
+    tabular_mdp = TabularMDP(next_states=env.hash_joint_action_indices(successors),
+                             rewards=env.joint_action_rewards,
+                             observations=env.one_hot_table[joint_action_indices],
+                             joint_action_indices=joint_action_indices.astype(env.joint_action_index_dtype))
+    for table in tabular_mdp: table.flags.writeable = False
+    compiled_tabular_mdps[key] = tabular_mdp
+    return tabular_mdp
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv
+
+
+@pytest.mark.parametrize('stacked_observations', [1, 3, 5])
+def test_batched_env_matches_individual_envs(stacked_observations):
+    num_envs, max_repetitions = 16, 4
+    payoffs = dict(payoff_rock_vs_paper=0.5, payoff_rock_vs_scissors=1.5, payoff_paper_vs_scissors=-2)
+    batched_env = BatchedRockPaperScissorsEnv(num_envs=num_envs, stacked_observations=stacked_observations,
+                                              max_repetitions=max_repetitions, **payoffs)
+    envs = [RockPaperScissorsEnv(stacked_observations=stacked_observations, max_repetitions=max_repetitions, **payoffs)
+            for _ in range(num_envs)]
+
+    batched_observations = batched_env.reset()
+    np.testing.assert_array_equal(batched_observations, [env.reset() for env in envs])
+
+    rng = np.random.RandomState(0)
+    for _ in range(3 * max_repetitions):  # Goes through several automatic resets
+        actions = rng.randint(0, 3, size=(num_envs, 2))
+        batched_observations, batched_rewards, batched_dones, _ = batched_env.step(actions)
+        for i, env in enumerate(envs):
+            observations, reward, done, _ = env.step(actions[i])
+            np.testing.assert_array_equal(batched_observations[i], observations)
+            np.testing.assert_array_equal(batched_rewards[i], reward)
+            assert batched_dones[i] == done
+            if done: env.reset()
+
+
+def test_batched_env_observations_are_not_shared_with_internal_state():
+    env = BatchedRockPaperScissorsEnv(num_envs=2)
+    observations = env.reset()
+    observations[0, 0] = -4
+    assert not np.any(env.state == -4)
+    assert not np.any(observations[0, 1] == -4)
+
+
+def test_batched_env_rejects_invalid_actions():
+    env = BatchedRockPaperScissorsEnv(num_envs=2)
+    env.reset()
+    with pytest.raises(ValueError):
+        env.step(np.zeros((3, 2), dtype=int))
+    with pytest.raises(ValueError):
+        env.step(np.array([[0, 3], [1, 1]]))
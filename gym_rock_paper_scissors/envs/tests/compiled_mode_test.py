@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv, compile_tabular_mdp
+
+
+@pytest.mark.parametrize('observation_mode', ['one_hot', 'joint_action_indices', 'state_hash'])
+@pytest.mark.parametrize('stacked_observations', [1, 3])
+def test_compiled_env_matches_uncompiled_env(observation_mode, stacked_observations):
+    kwargs = dict(stacked_observations=stacked_observations, max_repetitions=5, observation_mode=observation_mode, payoff_rock_vs_scissors=2)
+    env, compiled_env = RockPaperScissorsEnv(**kwargs), RockPaperScissorsEnv(compiled=True, **kwargs)
+    np.testing.assert_array_equal(env.reset(), compiled_env.reset())
+    rng = np.random.RandomState(0)
+    for _ in range(12):
+        action = rng.randint(0, 3, size=2)
+        observations, reward, done, info = env.step(action)
+        compiled_observations, compiled_reward, compiled_done, compiled_info = compiled_env.step(action)
+        np.testing.assert_array_equal(observations, compiled_observations)
+        assert observations.dtype == compiled_observations.dtype
+        assert (reward, done, info) == (compiled_reward, compiled_done, compiled_info)
+        np.testing.assert_array_equal(env.state, compiled_env.state)
+        if done: env.reset(), compiled_env.reset()
+
+
+def test_compiled_batched_env_matches_uncompiled_batched_env():
+    env, compiled_env = BatchedRockPaperScissorsEnv(num_envs=6, max_repetitions=4), BatchedRockPaperScissorsEnv(num_envs=6, max_repetitions=4, compiled=True)
+    env.reset(), compiled_env.reset()
+    rng = np.random.RandomState(0)
+    for _ in range(10):
+        actions = rng.randint(0, 3, size=(6, 2))
+        for result, compiled_result in zip(env.step(actions)[:3], compiled_env.step(actions)[:3]):
+            np.testing.assert_array_equal(result, compiled_result)
+
+
+def test_tabular_mdp_covers_full_state_space():
+    env = RockPaperScissorsEnv(stacked_observations=3)
+    tabular_mdp = compile_tabular_mdp(env)
+    assert tabular_mdp.next_states.shape == (820, 9)
+    assert tabular_mdp.observations.shape == (820, 3, 10)
+    assert tabular_mdp.next_states[0, 0] == 1 and tabular_mdp.next_states[0, 8] == 9
+    np.testing.assert_array_equal(env.hash_states(tabular_mdp.observations), np.arange(820))
+    np.testing.assert_array_equal(tabular_mdp.rewards.reshape(3, 3, 2), env.payoff_tensor)
+    # Every state with a full memory is reachable from 9 states with a full memory and 1 with a single empty action
+    assert np.all(np.bincount(tabular_mdp.next_states.ravel(), minlength=820)[91:] == 10)
+
+
+def test_tabular_mdps_are_cached_per_configuration():
+    assert compile_tabular_mdp(RockPaperScissorsEnv(stacked_observations=2)) is compile_tabular_mdp(RockPaperScissorsEnv(stacked_observations=2))
+    assert compile_tabular_mdp(RockPaperScissorsEnv(stacked_observations=2)) is not compile_tabular_mdp(RockPaperScissorsEnv(stacked_observations=2, payoff_rock_vs_paper=-2))
+    assert not compile_tabular_mdp(RockPaperScissorsEnv(stacked_observations=2)).next_states.flags.writeable
+
+
+def test_compiled_mode_refuses_to_exceed_memory_budget():
+    with pytest.raises(ValueError):
+        RockPaperScissorsEnv(stacked_observations=4, compiled=True, memory_budget=2**20)
+
+
+def test_memory_budget_is_enforced_for_cached_tabular_mdps():
+    RockPaperScissorsEnv(stacked_observations=3, compiled=True)
+    with pytest.raises(ValueError):
+        RockPaperScissorsEnv(stacked_observations=3, compiled=True, memory_budget=10)
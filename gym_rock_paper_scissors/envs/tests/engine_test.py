@@ -0,0 +1,97 @@
+import os
+import sys
+import subprocess
+
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEngine, BatchedRockPaperScissorsEngine, RockPaperScissorsEnv
+
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def run_python(code, python_path=()):
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([PACKAGE_ROOT, *python_path]))
+    return subprocess.run([sys.executable, '-c', code], env=environment, capture_output=True, text=True, check=True).stdout
+
+
+def test_engines_do_not_import_gym():
+    output = run_python('import sys\n'
+                        'import gym_rock_paper_scissors\n'
+                        'from gym_rock_paper_scissors.envs import RockPaperScissorsEngine, BatchedRockPaperScissorsEngine\n'
+                        'RockPaperScissorsEngine().step([0, 1])\n'
+                        'BatchedRockPaperScissorsEngine(num_envs=2).step([[0, 1], [2, 2]])\n'
+                        "print('gym' in sys.modules)")
+    assert output.strip() == 'False'
+
+
+@pytest.mark.parametrize('import_gym_first', [True, False])
+def test_envs_are_registered_in_gym_regardless_of_import_order(import_gym_first, tmp_path):
+    # Installs the package's 'gym.envs' entry point, as pip install does, through which gym registers
+    # the environments when it is imported after this package
+    distribution_info = tmp_path / 'gym_rock_paper_scissors-0.1.dist-info'
+    distribution_info.mkdir()
+    (distribution_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: gym_rock_paper_scissors\nVersion: 0.1\n')
+    (distribution_info / 'entry_points.txt').write_text('[gym.envs]\n__root__ = gym_rock_paper_scissors:register_envs\n')
+    imports = ['import gym', 'import gym_rock_paper_scissors']
+    if not import_gym_first: imports.reverse()
+    output = run_python('\n'.join(imports) + '\n'
+                        "env = gym.make('RockPaperScissors-v0', disable_env_checker=True)\n"
+                        "print(type(env.unwrapped).__name__)", python_path=[str(tmp_path)])
+    assert output.strip() == 'RockPaperScissorsEnv'
+
+
+def test_registration_errors_are_logged_instead_of_raised(monkeypatch, caplog):
+    from gym.envs import registration
+    from ... import register_envs
+    def failing_register(**kwargs): raise TypeError('Unsupported registry')
+    monkeypatch.setattr(registration, 'registry', {})
+    monkeypatch.setattr(registration, 'register', failing_register)
+    register_envs()
+    assert 'Unsupported registry' in caplog.text
+
+
+def test_engine_matches_env():
+    engine, env = RockPaperScissorsEngine(stacked_observations=2), RockPaperScissorsEnv(stacked_observations=2)
+    np.testing.assert_array_equal(engine.reset(), env.reset())
+    for joint_action in [[0, 1], [2, 2], [1, 0]]:
+        engine_observations, engine_reward, engine_done, engine_info = engine.step(joint_action)
+        env_observations, env_reward, env_done, env_info = env.step(joint_action)
+        np.testing.assert_array_equal(engine_observations, env_observations)
+        assert (engine_reward, engine_done, engine_info) == (env_reward, env_done, env_info)
+
+
+def test_engines_with_the_same_configuration_share_read_only_constants():
+    engine, other_engine = RockPaperScissorsEngine(stacked_observations=4), BatchedRockPaperScissorsEngine(num_envs=3, stacked_observations=4)
+    for attribute in ['payoff_tensor', 'one_hot_table', 'hash_powers', 'buffer_orderings']:
+        assert getattr(engine, attribute) is getattr(other_engine, attribute)
+        assert not getattr(engine, attribute).flags.writeable
+    assert RockPaperScissorsEngine(stacked_observations=5).hash_powers is not engine.hash_powers
+    assert RockPaperScissorsEngine(stacked_observations=4, payoff_rock_vs_paper=-2).payoff_tensor is not engine.payoff_tensor
+
+
+def test_engines_with_the_same_configuration_do_not_share_state():
+    engine, other_engine = RockPaperScissorsEngine(), RockPaperScissorsEngine()
+    engine.reset(), other_engine.reset()
+    engine.step([0, 1])
+    assert engine.state_hash != other_engine.state_hash
+    assert not np.array_equal(engine.joint_action_buffer, other_engine.joint_action_buffer)
+
+
+def test_env_spaces_are_built_lazily_for_every_env():
+    env, other_env = RockPaperScissorsEnv(), RockPaperScissorsEnv()
+    assert 'action_space' not in vars(env) and 'observation_space' not in vars(env)
+    assert env.action_space is env.action_space
+    assert env.action_space is not other_env.action_space
+    assert len(env.observation_space) == env.number_of_players
+
+
+def test_subclasses_overriding_configuration_methods_do_not_share_constants():
+    class TenfoldPayoffsEngine(RockPaperScissorsEngine):
+        def compile_payoff_tensor(self, payoff_matrix=None, number_of_players=None):
+            return super().compile_payoff_tensor(payoff_matrix, number_of_players) * 10
+
+    engine = RockPaperScissorsEngine(stacked_observations=4)
+    np.testing.assert_array_equal(TenfoldPayoffsEngine(stacked_observations=4).payoff_tensor[0, 2], [10, -10])
+    np.testing.assert_array_equal(RockPaperScissorsEngine(stacked_observations=4).payoff_tensor[0, 2], [1, -1])
+    assert BatchedRockPaperScissorsEngine(num_envs=2, stacked_observations=4).payoff_tensor is engine.payoff_tensor
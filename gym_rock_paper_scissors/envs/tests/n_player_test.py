@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv, Action, cyclic_payoff_tensor
+
+
+ROCK, PAPER, SCISSORS, SPOCK, LIZARD = range(5)
+
+
+def test_cyclic_payoff_tensor_with_three_actions_is_rock_paper_scissors():
+    np.testing.assert_array_equal(cyclic_payoff_tensor(3, 2), RockPaperScissorsEnv().payoff_tensor)
+
+
+def test_cyclic_payoff_tensor_with_even_number_of_actions_raises_value_error():
+    with pytest.raises(ValueError):
+        cyclic_payoff_tensor(4)
+
+
+def test_rock_paper_scissors_lizard_spock():
+    env = RockPaperScissorsEnv(payoff_matrix=cyclic_payoff_tensor(5))
+    assert env.number_of_players == 2 and env.action_space_size == 5
+    assert env.encoding_size == 26
+    assert env.state_space_size == 1 + 25 + 25**2 + 25**3
+    env.reset()
+    for winner, loser in [(ROCK, SCISSORS), (ROCK, LIZARD), (PAPER, ROCK), (PAPER, SPOCK), (SCISSORS, PAPER),
+                          (SCISSORS, LIZARD), (SPOCK, SCISSORS), (SPOCK, ROCK), (LIZARD, SPOCK), (LIZARD, PAPER)]:
+        _, reward, _, _ = env.step([winner, loser])
+        assert reward == [1, -1]
+    assert env.decode_joint_action_index(env.encode_joint_action([LIZARD, PAPER])) == [LIZARD, PAPER]
+
+
+def test_two_action_zero_sum_payoff_matrix():
+    env = RockPaperScissorsEnv(payoff_matrix=[[1, -1], [-1, 1]], stacked_observations=2)
+    assert env.action_space_size == 2 and env.encoding_size == 5
+    env.reset()
+    observations, reward, _, info = env.step([1, 0])
+    assert reward == [-1, 1]
+    assert info['state_hash'] == env.hash_state(observations[0]) == 1 + 2
+
+
+def test_three_player_rock_paper_scissors():
+    env = RockPaperScissorsEnv(number_of_players=3, stacked_observations=2)
+    assert env.payoff_tensor.shape == (3, 3, 3, 3)
+    assert env.encoding_size == 28
+    assert env.state_space_size == 1 + 27 + 27**2
+    assert len(env.action_space.spaces) == len(env.observation_space.spaces) == 3
+
+    observations = env.reset()
+    assert observations.shape == (3, 2, 28)
+    _, reward, _, _ = env.step([ROCK, ROCK, SCISSORS])
+    assert reward == [1, 1, -2]
+    _, reward, _, _ = env.step([ROCK, PAPER, SCISSORS])
+    assert reward == [0, 0, 0]
+    assert env.decode_state(env.state) == [[Action.ROCK, Action.ROCK, Action.SCISSORS],
+                                           [Action.ROCK, Action.PAPER, Action.SCISSORS]]
+
+
+def test_number_of_players_not_matching_payoff_matrix_raises_value_error():
+    with pytest.raises(ValueError):
+        RockPaperScissorsEnv(payoff_matrix=cyclic_payoff_tensor(3, 3), number_of_players=2)
+
+
+def test_action_vector_of_wrong_length_raises_value_error():
+    env = RockPaperScissorsEnv(number_of_players=3)
+    env.reset()
+    with pytest.raises(ValueError):
+        env.step([ROCK, PAPER])
+    with pytest.raises(ValueError):
+        env.step([ROCK, PAPER, 3])
+
+
+@pytest.mark.parametrize('number_of_actions, number_of_players', [(5, 2), (3, 3), (3, 4), (5, 3)])
+def test_rolling_state_hash_matches_hash_state(number_of_actions, number_of_players):
+    env = RockPaperScissorsEnv(payoff_matrix=cyclic_payoff_tensor(number_of_actions, number_of_players),
+                               stacked_observations=3, max_repetitions=20)
+    env.reset()
+    rng = np.random.RandomState(number_of_actions * number_of_players)
+    for _ in range(10):
+        observations, reward, _, info = env.step(rng.randint(0, number_of_actions, size=number_of_players))
+        assert sum(reward) == 0
+        assert info['state_hash'] == env.hash_state(observations[0])
+        np.testing.assert_array_equal(env.unhash_states(env.state_hash), env.joint_action_indices)
+
+
+def test_joint_action_indices_observations_of_large_games_use_wider_integers():
+    env = RockPaperScissorsEnv(number_of_players=5, observation_mode='joint_action_indices')
+    assert env.encoding_size == 244
+    observations = env.reset()
+    assert observations.dtype == np.int16
+    np.testing.assert_array_equal(observations, 243)
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_batched_env_matches_single_envs(compiled):
+    kwargs = dict(number_of_players=3, stacked_observations=2, max_repetitions=3, compiled=compiled)
+    batched_env = BatchedRockPaperScissorsEnv(num_envs=4, **kwargs)
+    single_envs = [RockPaperScissorsEnv(**kwargs) for _ in range(4)]
+    batched_observations = batched_env.reset()
+    assert batched_observations.shape == (4, 3, 2, 28)
+    for env in single_envs: env.reset()
+    rng = np.random.RandomState(0)
+    for _ in range(5):
+        actions = rng.randint(0, 3, size=(4, 3))
+        batched_observations, batched_rewards, batched_dones, _ = batched_env.step(actions)
+        for i, env in enumerate(single_envs):
+            observations, reward, done, _ = env.step(actions[i])
+            np.testing.assert_array_equal(batched_observations[i], observations)
+            np.testing.assert_array_equal(batched_rewards[i], reward)
+            assert batched_dones[i] == done
+            if done: env.reset()
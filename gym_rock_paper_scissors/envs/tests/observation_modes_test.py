@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv
+
+
+def play_random_steps(env, number_of_steps=7, seed=0):
+    rng = np.random.RandomState(seed)
+    yield env.reset()
+    for _ in range(number_of_steps):
+        observations, _, _, _ = env.step(rng.randint(0, 3, size=env.action_space.shape or 2))
+        yield observations
+
+
+@pytest.mark.parametrize('stacked_observations', [1, 3, 4])
+def test_compact_observations_match_one_hot_observations(stacked_observations):
+    one_hot_env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    indices_env = RockPaperScissorsEnv(stacked_observations=stacked_observations, observation_mode='joint_action_indices')
+    hash_env    = RockPaperScissorsEnv(stacked_observations=stacked_observations, observation_mode='state_hash')
+
+    for one_hot_observations, indices_observations, hash_observations in zip(play_random_steps(one_hot_env),
+                                                                            play_random_steps(indices_env),
+                                                                            play_random_steps(hash_env)):
+        assert indices_observations.dtype == np.int8
+        assert indices_env.observation_space.contains(indices_observations)
+        assert hash_env.observation_space.contains(hash_observations)
+        np.testing.assert_array_equal(indices_observations, np.argmax(one_hot_observations, axis=-1))
+        np.testing.assert_array_equal(hash_observations, one_hot_env.hash_states(one_hot_observations))
+
+
+def test_hash_state_and_decode_state_accept_every_observation_mode():
+    env = RockPaperScissorsEnv(stacked_observations=3)
+    for observations in play_random_steps(env):
+        one_hot_state = observations[0]
+        joint_action_indices = np.argmax(one_hot_state, axis=-1).astype(np.int8)
+        state_hash = env.hash_state(one_hot_state)
+
+        assert env.hash_state(joint_action_indices) == state_hash
+        assert env.hash_state(state_hash) == state_hash
+        assert env.decode_state(joint_action_indices) == env.decode_state(one_hot_state)
+        assert env.decode_state(state_hash) == env.decode_state(one_hot_state)
+
+
+def test_unhash_states_inverts_hashing_for_every_state():
+    env = RockPaperScissorsEnv(stacked_observations=3)
+    all_hashes = np.arange(env.state_space_size)
+    np.testing.assert_array_equal(env.hash_joint_action_indices(env.unhash_states(all_hashes)), all_hashes)
+
+
+@pytest.mark.parametrize('observation_mode', ['joint_action_indices', 'state_hash'])
+def test_batched_compact_observations_match_one_hot_observations(observation_mode):
+    one_hot_env = BatchedRockPaperScissorsEnv(num_envs=5, max_repetitions=4)
+    compact_env = BatchedRockPaperScissorsEnv(num_envs=5, max_repetitions=4, observation_mode=observation_mode)
+    for one_hot_observations, compact_observations in zip(play_random_steps(one_hot_env), play_random_steps(compact_env)):
+        assert compact_env.observation_space.contains(compact_observations)
+        expected_observations = np.argmax(one_hot_observations, axis=-1)
+        if observation_mode == 'state_hash': expected_observations = one_hot_env.hash_joint_action_indices(expected_observations)
+        np.testing.assert_array_equal(compact_observations, expected_observations)
+
+
+def test_unknown_observation_mode_raises_value_error():
+    with pytest.raises(ValueError):
+        RockPaperScissorsEnv(observation_mode='pixels')
+
+
+@pytest.mark.parametrize('observation_mode', ['one_hot', 'joint_action_indices', 'state_hash'])
+def test_encode_observations_matches_observe(observation_mode):
+    env = RockPaperScissorsEnv(stacked_observations=3, observation_mode=observation_mode)
+    env.reset()
+    for joint_action in [[0, 1], [2, 2]]:
+        observations, _, _, _ = env.step(joint_action)
+        np.testing.assert_array_equal(env.encode_observations(env.joint_action_indices), observations[0])
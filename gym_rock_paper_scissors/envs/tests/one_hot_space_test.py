@@ -0,0 +1,48 @@
+import numpy as np
+from .. import RockPaperScissorsEnv
+from ..one_hot_space import OneHotEncoding
+
+
+def test_contains_accepts_only_one_hot_vectors():
+    space = OneHotEncoding(size=4)
+    assert space.contains(np.array([0, 0, 1, 0]))
+    assert space.contains([0., 1., 0., 0.])
+    assert not space.contains(np.array([0, 0, 0, 0]))
+    assert not space.contains(np.array([0, 1, 1, 0]))
+    assert not space.contains(np.array([0, 2, 0, 0]))
+    assert not space.contains(np.array([0, 1, 0]))
+    assert not space.contains(np.eye(4))
+    assert not space.contains(1)
+
+
+def test_contains_batch_matches_contains():
+    space = OneHotEncoding(size=4)
+    vectors = np.array([[0, 0, 1, 0], [0, 0, 0, 0], [1, 1, 0, 0], [0, -1, 0, 1], [1, 0, 0, 0]])
+    np.testing.assert_array_equal(space.contains_batch(vectors), [space.contains(v) for v in vectors])
+    assert not space.contains_batch(np.zeros((2, 3))).any()
+
+
+def test_samples_are_contained_in_space():
+    space = OneHotEncoding(size=10)
+    space.seed(0)
+    assert space.contains(space.sample())
+    samples = space.sample(1000)
+    assert samples.shape == (1000, 10) and samples.dtype == space.dtype
+    assert space.contains_batch(samples).all()
+    assert set(np.argmax(samples, axis=-1)) == set(range(10))
+
+
+def test_sampling_with_random_state_of_older_gym_releases():
+    space = OneHotEncoding(size=10)
+    space._np_random = np.random.RandomState(0)  # What np_random returns in older gym releases
+    assert space.contains(space.sample())
+    assert space.contains_batch(space.sample(100)).all()
+
+
+def test_environment_observations_are_contained_in_observation_space():
+    env = RockPaperScissorsEnv()
+    assert env.observation_space.contains(env.reset())
+    observations, _, _, _ = env.step([0, 2])
+    assert env.observation_space.contains(observations)
+    observations[0, 0] = 0
+    assert not env.observation_space.contains(observations)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv
+from .. import Action
+
+
+def test_payoff_tensor_is_compiled_from_payoffs():
+    r_p, r_s, p_s = 0.5, 1.5, 2
+    env = RockPaperScissorsEnv(payoff_rock_vs_paper=r_p, payoff_rock_vs_scissors=r_s, payoff_paper_vs_scissors=p_s)
+    assert env.payoff_tensor.shape == (3, 3, 2)
+    assert not env.payoff_tensor.flags.writeable
+    for a1 in range(3):
+        for a2 in range(3):
+            assert env.payoff_tensor[a1, a2].tolist() == env.reward_function([Action(a1), Action(a2)])
+            assert env.payoff_tensor[a1, a2].tolist() == env.reward_function([a1, a2])
+
+
+def test_zero_sum_payoff_matrix_can_be_given():
+    payoff_matrix = [[0, -1, 2], [1, 0, -3], [-2, 3, 0]]
+    env = RockPaperScissorsEnv(payoff_matrix=payoff_matrix)
+    env.reset()
+    _, (r1, r2), _, _ = env.step([0, 2])
+    assert r1 == 2 and r2 == -2
+    _, (r1, r2), _, _ = env.step([2, 1])
+    assert r1 == 3 and r2 == -3
+
+
+def test_general_sum_payoff_tensor_can_be_given():
+    payoff_tensor = np.arange(18).reshape(3, 3, 2)
+    env = RockPaperScissorsEnv(payoff_matrix=payoff_tensor)
+    env.reset()
+    _, (r1, r2), _, _ = env.step([1, 2])
+    assert r1 == 10 and r2 == 11
+    np.testing.assert_array_equal(env.rewards([[1, 2], [0, 0]]), [[10, 11], [0, 1]])
+
+
+@pytest.mark.parametrize('shape', [(3, 2), (3, 3, 3), (3, 2, 2), (3,)])
+def test_payoff_matrix_with_invalid_shape_raises_value_error(shape):
+    with pytest.raises(ValueError):
+        RockPaperScissorsEnv(payoff_matrix=np.zeros(shape))
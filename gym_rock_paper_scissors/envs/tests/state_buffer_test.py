@@ -0,0 +1,33 @@
+import numpy as np
+from .. import RockPaperScissorsEnv
+
+
+def test_state_keeps_latest_joint_actions_from_oldest_to_newest():
+    env = RockPaperScissorsEnv(stacked_observations=3)
+    env.reset()
+    joint_actions = [[0, 1], [2, 2], [1, 0], [0, 2], [2, 1]]
+    for i, joint_action in enumerate(joint_actions):
+        observations, _, _, _ = env.step(joint_action)
+        recalled_actions = joint_actions[max(0, i - 2): i + 1]
+        expected_indices = [9] * (3 - len(recalled_actions)) + [3 * a1 + a2 for a1, a2 in recalled_actions]
+        expected_state   = np.eye(10)[expected_indices]
+        np.testing.assert_array_equal(env.state, expected_state)
+        np.testing.assert_array_equal(observations[0], expected_state)
+        np.testing.assert_array_equal(observations[1], expected_state)
+
+
+def test_player_observations_do_not_share_memory():
+    env = RockPaperScissorsEnv()
+    observation_1, observation_2 = env.reset()
+    assert not np.shares_memory(observation_1, observation_2)
+    (observation_1, observation_2), _, _, _ = env.step([0, 1])
+    assert not np.shares_memory(observation_1, observation_2)
+
+
+def test_reset_empties_state():
+    env = RockPaperScissorsEnv()
+    env.reset()
+    for _ in range(5): env.step([1, 2])
+    observations = env.reset()
+    np.testing.assert_array_equal(env.state, env.initial_state)
+    np.testing.assert_array_equal(observations[0], env.initial_state)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from .. import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv
+
+
+@pytest.mark.parametrize('stacked_observations', range(1, 6))
+def test_rolling_state_hash_matches_hash_state(stacked_observations):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations, max_repetitions=20)
+    observations = env.reset()
+    assert env.state_hash == env.hash_state(observations[0]) == 0
+    rng = np.random.RandomState(stacked_observations)
+    for _ in range(20):
+        observations, _, _, info = env.step(rng.randint(0, 3, size=2))
+        assert info['state_hash'] == env.state_hash == env.hash_state(observations[0])
+
+
+@pytest.mark.parametrize('stacked_observations', range(1, 6))
+def test_batched_rolling_state_hash_matches_hash_state(stacked_observations):
+    env = BatchedRockPaperScissorsEnv(num_envs=8, stacked_observations=stacked_observations, max_repetitions=4)
+    env.reset()
+    rng = np.random.RandomState(stacked_observations)
+    for _ in range(10):
+        observations, _, dones, info = env.step(rng.randint(0, 3, size=(8, 2)))
+        expected_hashes = [env.hash_state(observation[0]) for observation in observations]
+        np.testing.assert_array_equal(info['state_hash'], expected_hashes)
+        np.testing.assert_array_equal(env.state_hash[dones], 0)
+
+
+@pytest.mark.parametrize('stacked_observations', range(1, 5))
+def test_hash_states_matches_hash_state_for_every_state(stacked_observations):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations)
+    # Every combination of joint actions, including empty actions in any position
+    all_joint_action_indices = np.array(np.meshgrid(*[range(env.encoding_size)] * stacked_observations)).reshape(stacked_observations, -1).T
+    states = np.eye(env.encoding_size)[all_joint_action_indices]
+
+    hashes = env.hash_states(states)
+    np.testing.assert_array_equal(hashes, [env.hash_state(state) for state in states])
+    assert hashes.min() == 0 and hashes.max() == env.state_space_size - 1
+
+
+def test_setting_state_recomputes_state_hash():
+    env = RockPaperScissorsEnv(stacked_observations=2)
+    env.state = [np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 0]), np.array([0, 0, 0, 0, 0, 0, 0, 1, 0, 0])]
+    assert env.state_hash == 89
+    _, _, _, info = env.step([2, 2])
+    assert info['state_hash'] == env.hash_state(env.state)
+
+
+@pytest.mark.parametrize('stacked_observations', range(1, 5))
+@pytest.mark.parametrize('compiled', [False, True])
+def test_transition_state_hashes_matches_stepping(stacked_observations, compiled):
+    env = RockPaperScissorsEnv(stacked_observations=stacked_observations, compiled=compiled)
+    state_hashes = np.arange(env.state_space_size)
+    joint_action_indices = np.random.RandomState(0).randint(0, env.joint_action_space_size, size=env.state_space_size)
+    expected_hashes = []
+    for state_hash, joint_action_index in zip(state_hashes, joint_action_indices):
+        env.state = env.one_hot_table[env.unhash_states(state_hash)]
+        env.transition_probability_function(int(joint_action_index))
+        expected_hashes.append(env.state_hash)
+    np.testing.assert_array_equal(env.transition_state_hashes(state_hashes, joint_action_indices), expected_hashes)
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 import numpy as np
 
 
@@ -8,10 +9,11 @@ class MixedStrategyAgent():
     the set of all possible actions.
     '''
 
-    def __init__(self, support_vector, name):
+    def __init__(self, support_vector, name, seed=None):
         '''
         Checks that the support vector is a valid probability distribution
         :param support_vector: support vector for all three possible pure strategies [ROCK, PAPER, SCISSORS]
+        :param seed: seed for the agent's random number generator
         :throws ValueError: If support vector is not a valid probability distribution
         '''
         if any(map(lambda support: support < 0, support_vector)):
@@ -21,12 +23,34 @@ class MixedStrategyAgent():
         self.support_vector = support_vector
         self.name = name
 
+        # Actions are sampled by inverting the cumulative distribution of the support vector
+        self.cumulative_support = np.cumsum(support_vector, dtype=np.float64)
+        self.cumulative_support[-1] = 1.0
+        self.cumulative_support_list = self.cumulative_support.tolist()
+        self.rng = np.random.default_rng(seed)
+
     def take_action(self, state):
         '''
         Samples an action based on the probabilities presented by the agent's support vector
         :param state: Ignored for fixed agents
         '''
-        return np.random.choice([0, 1, 2], p=self.support_vector)
+        return bisect_right(self.cumulative_support_list, self.rng.random())
+
+    def take_actions(self, states):
+        '''
+        Batched version of take_action, which samples an action for each state
+        :param states: batch of states, only its length is used by fixed agents
+        :returns: integer array containing an action for each state
+        '''
+        return self.sample_actions(len(states))
+
+    def sample_actions(self, number_of_actions):
+        '''
+        Samples :param: number_of_actions independent actions from the agent's support vector
+        :param number_of_actions: number of actions to sample
+        :returns: integer array of shape (number_of_actions,)
+        '''
+        return np.searchsorted(self.cumulative_support, self.rng.random(number_of_actions), side='right')
 
     def handle_experience(self, *args):
         pass
@@ -0,0 +1,39 @@
+import numpy as np
+
+
+class MixedStrategyPopulation():
+    '''
+    Vectorized population of MixedStrategyAgents, which samples actions for
+    many agents with different support vectors in a single call.
+    '''
+
+    def __init__(self, agents, seed=None):
+        '''
+        :param agents: list of MixedStrategyAgents forming the population
+        :param seed: seed for the population's random number generator
+        :throws ValueError: If the population is empty
+        '''
+        if len(agents) == 0:
+            raise ValueError('A population should contain at least one agent')
+        self.agents = list(agents)
+        self.names  = [agent.name for agent in self.agents]
+        self.support_vectors     = np.array([agent.support_vector for agent in self.agents], dtype=np.float64)
+        self.cumulative_supports = np.array([agent.cumulative_support for agent in self.agents])
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return len(self.agents)
+
+    def sample_actions(self, agent_indices=None):
+        '''
+        Samples an independent action for every agent in :param: agent_indices.
+        For instance, a population driving a BatchedRockPaperScissorsEnv can sample
+        the actions of one of its players with agent_indices containing the agent
+        which plays each game.
+        :param agent_indices: integer array of any shape indexing agents in the population.
+                              If None, an action is sampled for every agent in the population
+        :returns: integer array with the same shape as :param: agent_indices, or (len(population),)
+        '''
+        cumulative_supports = self.cumulative_supports if agent_indices is None else self.cumulative_supports[agent_indices]
+        samples = self.rng.random(cumulative_supports.shape[:-1])
+        return np.count_nonzero(cumulative_supports <= samples[..., np.newaxis], axis=-1)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from .. import MixedStrategyAgent, MixedStrategyPopulation
+from .. import rockAgent, paperAgent, scissorsAgent, fixedAgents
+from ...envs import BatchedRockPaperScissorsEnv
+
+
+def test_pure_strategies_always_take_their_action():
+    for action, agent in enumerate([rockAgent, paperAgent, scissorsAgent]):
+        assert all(agent.take_action(None) == action for _ in range(100))
+        assert (agent.sample_actions(100) == action).all()
+        assert (agent.take_actions([None] * 10) == action).all()
+
+
+def test_sampled_actions_follow_support_vector():
+    support_vector = [0.2, 0.5, 0.3]
+    agent = MixedStrategyAgent(support_vector=support_vector, name='Mixed', seed=0)
+    frequencies = np.bincount(agent.sample_actions(100000), minlength=3) / 100000
+    np.testing.assert_allclose(frequencies, support_vector, atol=0.01)
+    frequencies = np.bincount([agent.take_action(None) for _ in range(100000)], minlength=3) / 100000
+    np.testing.assert_allclose(frequencies, support_vector, atol=0.01)
+
+
+def test_seeded_agents_are_reproducible():
+    agent_1 = MixedStrategyAgent(support_vector=[1/3, 1/3, 1/3], name='Random', seed=42)
+    agent_2 = MixedStrategyAgent(support_vector=[1/3, 1/3, 1/3], name='Random', seed=42)
+    np.testing.assert_array_equal(agent_1.sample_actions(50), agent_2.sample_actions(50))
+    assert [agent_1.take_action(None) for _ in range(50)] == [agent_2.take_action(None) for _ in range(50)]
+
+
+def test_population_samples_follow_each_support_vector():
+    mixed_agent = MixedStrategyAgent(support_vector=[0.6, 0, 0.4], name='Mixed')
+    population  = MixedStrategyPopulation(fixedAgents + [mixed_agent], seed=0)
+    agent_indices = np.repeat(np.arange(len(population)), 20000)
+    actions = population.sample_actions(agent_indices).reshape(len(population), -1)
+    for agent, agent_actions in zip(population.agents, actions):
+        frequencies = np.bincount(agent_actions, minlength=3) / agent_actions.size
+        np.testing.assert_allclose(frequencies, agent.support_vector, atol=0.02)
+    assert population.sample_actions().shape == (len(population),)
+
+
+def test_populations_drive_batched_env():
+    num_envs = 12
+    env = BatchedRockPaperScissorsEnv(num_envs=num_envs)
+    player_1_population = MixedStrategyPopulation([rockAgent], seed=0)
+    player_2_population = MixedStrategyPopulation([paperAgent, scissorsAgent], seed=1)
+    env.reset()
+    actions = np.stack([player_1_population.sample_actions(np.zeros(num_envs, dtype=int)),
+                        player_2_population.sample_actions(np.arange(num_envs) % 2)], axis=1)
+    _, rewards, _, _ = env.step(actions)
+    np.testing.assert_array_equal(rewards[:, 0], np.where(np.arange(num_envs) % 2 == 0, -1, 1))
+
+
+def test_empty_population_raises_value_error():
+    with pytest.raises(ValueError):
+        MixedStrategyPopulation([])
@@ -0,0 +1,176 @@
+import sys
+import time
+import functools
+
+
+# Methods instrumented by default whenever the instrumented object has them. They cover the phases of
+# RockPaperScissorsEnv, BatchedRockPaperScissorsEnv, MixedStrategyAgent and MixedStrategyPopulation
+DEFAULT_METHODS = ('step', 'reset', 'transition_probability_function', 'observe', 'reward_function', 'rewards',
+                   'encode_joint_action', 'encode_joint_actions', 'reset_games',
+                   'take_action', 'take_actions', 'sample_actions')
+
+
+class PhaseStatistics():
+    '''
+    Counters of the calls to a single instrumented method. Durations are in nanoseconds and
+    are also counted in a histogram of power of two buckets, where bucket b counts durations
+    in [2**(b - 1), 2**b). Allocated blocks are the number of memory blocks held by the
+    interpreter after a call minus before it, so they count objects that outlive the call.
+    '''
+
+    def __init__(self):
+        self.count            = 0
+        self.total_time       = 0  # Including the time spent in other instrumented methods
+        self.self_time        = 0  # Excluding the time spent in other instrumented methods
+        self.min_time         = None
+        self.max_time         = 0
+        self.allocated_blocks = 0
+        self.histogram        = [0] * 64
+
+    def record(self, elapsed_time, self_time, allocated_blocks):
+        self.count      += 1
+        self.total_time += elapsed_time
+        self.self_time  += self_time
+        self.allocated_blocks += allocated_blocks
+        if self.min_time is None or elapsed_time < self.min_time: self.min_time = elapsed_time
+        if elapsed_time > self.max_time: self.max_time = elapsed_time
+        self.histogram[min(elapsed_time.bit_length(), 63)] += 1
+
+    def percentile(self, q):
+        '''
+        Upper bound of the :param: q percentile of the durations, in nanoseconds, from the histogram
+        '''
+        if self.count == 0: return 0
+        threshold, cumulative_count = q / 100 * self.count, 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            cumulative_count += bucket_count
+            if cumulative_count >= threshold and bucket_count > 0: return min(2**bucket, self.max_time)
+        return self.max_time
+
+    def as_dict(self):
+        return dict(count=self.count, total_seconds=self.total_time / 1e9, self_seconds=self.self_time / 1e9,
+                    mean_seconds=self.total_time / 1e9 / max(self.count, 1),
+                    min_seconds=(self.min_time or 0) / 1e9, max_seconds=self.max_time / 1e9,
+                    p50_seconds=self.percentile(50) / 1e9, p99_seconds=self.percentile(99) / 1e9,
+                    allocated_blocks=self.allocated_blocks, allocated_blocks_per_call=self.allocated_blocks / max(self.count, 1))
+
+
+class Profiler():
+    '''
+    Opt-in instrumentation which attributes time and memory allocations to the methods of
+    environments and agents. Instrumenting an object replaces its methods with timed wrappers,
+    set as attributes of that instance only, so classes and uninstrumented objects are left untouched
+    and cost nothing. Calls to instrumented methods made from other instrumented methods, such as
+    transition_probability_function from step, are subtracted from the caller's self time.
+    Assumes that instrumented objects are used from a single thread.
+
+    Example usage:
+    profiler = Profiler(report_interval=60)
+    with profiler.instrument(env, label='env').instrument(agent, label='agent'):
+        ... # training loop
+    print(profiler.summary())
+    '''
+
+    def __init__(self, count_allocations=False, report_interval=None, report=print):
+        '''
+        :param count_allocations: Whether to count the memory blocks allocated by every call. Counting walks the
+                                  interpreter's memory arenas, which takes a few microseconds per call
+        :param report_interval: Seconds between periodic summaries, which are reported after an outermost
+                                instrumented call returns. No periodic summaries are reported if None
+        :param report: Function called with every periodic summary
+        '''
+        self.count_allocations = count_allocations
+        self.report_interval   = report_interval
+        self.report            = report
+        self.phases = {}
+        self.instrumented_objects = []
+        self.child_times = []  # Time spent in instrumented calls made by each instrumented call being executed
+        self.next_report_time = None if report_interval is None else time.perf_counter() + report_interval
+
+    def instrument(self, obj, methods=None, label=None):
+        '''
+        Instruments the methods of :param: obj
+        :param methods: names of the methods to instrument, defaults to every method in DEFAULT_METHODS that obj has
+        :param label: prefix of the phase names, which are '<label>.<method>'. Defaults to the name of obj's class
+        :returns: the profiler, so that calls can be chained
+        '''
+        label   = type(obj).__name__ if label is None else label
+        methods = [method for method in DEFAULT_METHODS if callable(getattr(obj, method, None))] if methods is None else methods
+        for method in methods:
+            if method in vars(obj): continue  # Already instrumented
+            setattr(obj, method, self.instrument_method(getattr(obj, method), '{}.{}'.format(label, method)))
+        self.instrumented_objects.append((obj, methods))
+        return self
+
+    def instrument_method(self, method, phase):
+        statistics = self.phases.setdefault(phase, PhaseStatistics())
+        child_times = self.child_times
+        count_allocations = self.count_allocations
+        perf_counter_ns, getallocatedblocks = time.perf_counter_ns, sys.getallocatedblocks
+
+        @functools.wraps(method)
+        def instrumented_method(*args, **kwargs):
+            child_times.append(0)
+            blocks = getallocatedblocks() if count_allocations else 0
+            start  = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed_time = perf_counter_ns() - start
+                allocated_blocks = getallocatedblocks() - blocks if count_allocations else 0
+                statistics.record(elapsed_time, elapsed_time - child_times.pop(), allocated_blocks)
+                if child_times: child_times[-1] += elapsed_time
+                elif self.next_report_time is not None: self.report_periodically()
+        instrumented_method.profiler = self
+        return instrumented_method
+
+    def uninstrument(self):
+        '''
+        Restores the original methods of every instrumented object
+        '''
+        for obj, methods in self.instrumented_objects:
+            for method in methods:
+                if getattr(vars(obj).get(method), 'profiler', None) is self: delattr(obj, method)
+        self.instrumented_objects = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.uninstrument()
+
+    def report_periodically(self):
+        now = time.perf_counter()
+        if now >= self.next_report_time:
+            self.next_report_time = now + self.report_interval
+            self.report(self.summary())
+
+    def statistics(self):
+        '''
+        :returns: dictionary from phase name to a dictionary of its statistics (see PhaseStatistics.as_dict)
+        '''
+        return {phase: statistics.as_dict() for phase, statistics in self.phases.items()}
+
+    def reset(self):
+        '''
+        Clears the statistics of every phase
+        '''
+        for statistics in self.phases.values():
+            statistics.__init__()
+
+    def summary(self):
+        '''
+        :returns: table of every phase which has been called, sorted by self time
+        '''
+        phases = sorted((item for item in self.phases.items() if item[1].count > 0), key=lambda item: -item[1].self_time)
+        total_self_time = sum(statistics.self_time for _, statistics in phases) or 1
+        width = max([len(phase) for phase, _ in phases] + [5])
+        lines = ['{:<{width}} {:>10} {:>11} {:>11} {:>6} {:>10} {:>10} {:>10} {:>13}'.format(
+                 'phase', 'calls', 'total ms', 'self ms', 'self%', 'mean us', 'p99 us', 'max us', 'blocks/call', width=width)]
+        for phase, statistics in phases:
+            lines.append('{:<{width}} {:>10} {:>11.2f} {:>11.2f} {:>6.1f} {:>10.2f} {:>10.2f} {:>10.2f} {:>13.2f}'.format(
+                         phase, statistics.count, statistics.total_time / 1e6, statistics.self_time / 1e6,
+                         100 * statistics.self_time / total_self_time, statistics.total_time / 1e3 / statistics.count,
+                         statistics.percentile(99) / 1e3, statistics.max_time / 1e3,
+                         statistics.allocated_blocks / statistics.count, width=width))
+        return '\n'.join(lines)
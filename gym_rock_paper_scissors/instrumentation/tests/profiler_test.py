@@ -0,0 +1,80 @@
+import numpy as np
+from .. import Profiler
+from ...envs import RockPaperScissorsEnv, BatchedRockPaperScissorsEnv
+from ...fixed_agents import MixedStrategyAgent
+
+
+def test_instrumented_env_records_every_phase():
+    env = RockPaperScissorsEnv(max_repetitions=5)
+    profiler = Profiler(count_allocations=True).instrument(env, label='env')
+    env.reset()
+    for _ in range(5): env.step([0, 1])
+    statistics = profiler.statistics()
+    assert statistics['env.step']['count'] == 5
+    assert statistics['env.transition_probability_function']['count'] == 5
+    assert statistics['env.encode_joint_action']['count'] == 5
+    assert statistics['env.observe']['count'] == 6  # Reset also observes
+    assert statistics['env.reward_function']['count'] == 0
+    step = statistics['env.step']
+    assert 0 < step['self_seconds'] < step['total_seconds']
+    assert isinstance(step['allocated_blocks'], int)
+    assert step['min_seconds'] <= step['p50_seconds'] <= step['p99_seconds'] <= step['max_seconds']
+
+
+def test_self_time_excludes_instrumented_calls():
+    env = RockPaperScissorsEnv()
+    env.reset()
+    profiler = Profiler().instrument(env, label='env')
+    for _ in range(5): env.step([2, 1])
+    statistics = profiler.statistics()
+    child_time = sum(statistics['env.{}'.format(phase)]['total_seconds'] for phase in ['transition_probability_function', 'encode_joint_action', 'observe'])
+    assert abs(statistics['env.step']['self_seconds'] + child_time - statistics['env.step']['total_seconds']) < 1e-9
+
+
+def test_uninstrumenting_restores_original_methods():
+    env = RockPaperScissorsEnv()
+    with Profiler().instrument(env) as profiler:
+        assert 'step' in vars(env)
+        env.reset()
+    assert 'step' not in vars(env) and 'observe' not in vars(env)
+    env.step([0, 0])
+    assert profiler.statistics()['RockPaperScissorsEnv.step']['count'] == 0
+
+
+def test_instrumented_objects_behave_as_uninstrumented_ones():
+    envs = [BatchedRockPaperScissorsEnv(num_envs=4, max_repetitions=3) for _ in range(2)]
+    agents = [MixedStrategyAgent([0.5, 0.25, 0.25], name='agent', seed=0) for _ in range(2)]
+    profiler = Profiler().instrument(envs[0]).instrument(agents[0])
+    results = []
+    for env, agent in zip(envs, agents):
+        env.reset()
+        results.append([env.step(np.stack([agent.take_actions(range(4)), agent.sample_actions(4)], axis=1)) for _ in range(4)])
+    for (observations, rewards, dones, info), (expected_observations, expected_rewards, expected_dones, expected_info) in zip(*results):
+        np.testing.assert_array_equal(observations, expected_observations)
+        np.testing.assert_array_equal(rewards, expected_rewards)
+        np.testing.assert_array_equal(dones, expected_dones)
+        np.testing.assert_array_equal(info['state_hash'], expected_info['state_hash'])
+    statistics = profiler.statistics()
+    assert statistics['BatchedRockPaperScissorsEnv.reset_games']['count'] == 1
+    assert statistics['MixedStrategyAgent.take_actions']['count'] == 4
+    assert statistics['MixedStrategyAgent.sample_actions']['count'] == 8  # take_actions samples actions too
+
+
+def test_periodic_summaries_are_reported():
+    summaries = []
+    env = RockPaperScissorsEnv()
+    profiler = Profiler(report_interval=0, report=summaries.append).instrument(env, label='env')
+    env.reset()
+    env.step([0, 0])
+    assert len(summaries) == 2  # After each outermost call
+    assert summaries[-1].splitlines()[0].split()[0] == 'phase'
+    assert any(line.startswith('env.step') for line in summaries[-1].splitlines())
+
+
+def test_reset_clears_statistics():
+    agent = MixedStrategyAgent([1, 0, 0], name='agent')
+    profiler = Profiler().instrument(agent)
+    agent.take_action(None)
+    profiler.reset()
+    assert profiler.statistics()['MixedStrategyAgent.take_action']['count'] == 0
+    assert profiler.summary().count('\n') == 0
@@ -0,0 +1,2 @@
+from .trajectory_recorder import TrajectoryRecorder
+from .trajectory_reader import TrajectoryReader, Episode
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from .. import TrajectoryRecorder, TrajectoryReader
+from ...envs import RockPaperScissorsEnv
+
+
+def record_episodes(directory, number_of_episodes, seed, **env_kwargs):
+    env = TrajectoryRecorder(RockPaperScissorsEnv(**env_kwargs), directory=str(directory))
+    rng = np.random.RandomState(seed)
+    episodes = []
+    for _ in range(number_of_episodes):
+        observations, done = env.reset(), False
+        episode = []
+        while not done:
+            action = rng.randint(0, env.unwrapped.action_space_size, size=env.unwrapped.number_of_players).tolist()
+            observations, reward, done, info = env.step(action)
+            episode.append((action, reward, info['state_hash'], observations[0]))
+        episodes.append(episode)
+    env.close()
+    return episodes
+
+
+def test_reader_returns_recorded_episodes(tmp_path):
+    episodes = record_episodes(tmp_path, number_of_episodes=5, seed=0, max_repetitions=4, payoff_rock_vs_paper=-0.5)
+    reader = TrajectoryReader(str(tmp_path))
+    assert len(reader) == 20 and reader.number_of_episodes == 5
+    assert reader.joint_actions.dtype == np.int8
+    for episode, recorded_episode in zip(episodes, reader.episodes()):
+        actions, rewards, state_hashes, _ = zip(*episode)
+        np.testing.assert_array_equal(recorded_episode.joint_actions, actions)
+        np.testing.assert_array_equal(recorded_episode.rewards, rewards)
+        np.testing.assert_array_equal(recorded_episode.state_hashes, state_hashes)
+
+
+def test_reader_returns_recorded_episodes_of_three_player_games(tmp_path):
+    episodes = record_episodes(tmp_path, number_of_episodes=2, seed=0, max_repetitions=4, number_of_players=3)
+    reader = TrajectoryReader(str(tmp_path))
+    assert reader.env.number_of_players == 3
+    assert reader.joint_actions.shape == reader.rewards.shape == (8, 3)
+    expected_observations = np.array([observation for episode in episodes for (_, _, _, observation) in episode])
+    np.testing.assert_array_equal(reader.observations(np.arange(len(reader))), expected_observations)
+
+
+@pytest.mark.parametrize('stacked_observations', [1, 3])
+def test_observations_are_rebuilt_from_joint_actions(tmp_path, stacked_observations):
+    episodes = record_episodes(tmp_path, number_of_episodes=3, seed=1, max_repetitions=5, stacked_observations=stacked_observations)
+    reader = TrajectoryReader(str(tmp_path))
+    expected_observations = np.array([observation for episode in episodes for (_, _, _, observation) in episode])
+    random_indices = np.random.RandomState(0).randint(len(reader), size=(4, 5))
+    np.testing.assert_array_equal(reader.observations(np.arange(len(reader))), expected_observations)
+    np.testing.assert_array_equal(reader.observations(random_indices), expected_observations[random_indices])
+    np.testing.assert_array_equal(reader.env.hash_states(reader.observations(np.arange(len(reader)))), reader.state_hashes)
+    np.testing.assert_array_equal(reader.observations(random_indices, observation_mode='joint_action_indices'),
+                                  np.argmax(expected_observations[random_indices], axis=-1))
+
+
+def test_recording_appends_to_existing_trajectories(tmp_path):
+    record_episodes(tmp_path, number_of_episodes=2, seed=0, max_repetitions=3)
+    record_episodes(tmp_path, number_of_episodes=1, seed=1, max_repetitions=3)
+    reader = TrajectoryReader(str(tmp_path))
+    assert len(reader) == 9
+    np.testing.assert_array_equal(reader.episode_starts, [0, 3, 6])
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(RockPaperScissorsEnv(stacked_observations=2), directory=str(tmp_path))
+
+
+def test_unfinished_episodes_are_written_on_reset(tmp_path):
+    env = TrajectoryRecorder(RockPaperScissorsEnv(max_repetitions=10), directory=str(tmp_path))
+    env.reset()
+    env.step([0, 1])
+    env.step([1, 1])
+    env.reset()
+    env.step([2, 0])
+    env.close()
+    reader = TrajectoryReader(str(tmp_path))
+    np.testing.assert_array_equal(reader.episode(0).joint_actions, [[0, 1], [1, 1]])
+    np.testing.assert_array_equal(reader.episode(1).joint_actions, [[2, 0]])
+
+
+def test_steps_with_a_reused_action_buffer_are_recorded(tmp_path):
+    env = TrajectoryRecorder(RockPaperScissorsEnv(max_repetitions=3), directory=str(tmp_path))
+    env.reset()
+    action = np.zeros(2, dtype=np.int64)
+    state_hashes = []
+    for joint_action in [[0, 1], [1, 2], [2, 0]]:
+        action[:] = joint_action
+        state_hashes.append(env.step(action)[3]['state_hash'])
+    env.close()
+    episode = TrajectoryReader(str(tmp_path)).episode(0)
+    np.testing.assert_array_equal(episode.joint_actions, [[0, 1], [1, 2], [2, 0]])
+    np.testing.assert_array_equal(episode.state_hashes, state_hashes)
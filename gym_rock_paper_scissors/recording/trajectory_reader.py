@@ -0,0 +1,89 @@
+import os
+import json
+from collections import namedtuple
+
+import numpy as np
+
+from ..envs import RockPaperScissorsEngine
+from .trajectory_recorder import COLUMNS, METADATA_FILE, column_path, column_shape
+
+
+Episode = namedtuple('Episode', ['joint_actions', 'rewards', 'state_hashes'])
+
+
+class TrajectoryReader():
+    '''
+    Reads trajectories written by a TrajectoryRecorder through memory maps, so that any
+    number of steps can be streamed or randomly indexed without loading them into memory.
+    Columns are exposed as (read only) arrays indexed by step: joint_actions, rewards and
+    state_hashes, plus episode_starts, indexed by episode.
+
+    Example usage:
+    reader = TrajectoryReader('trajectories')
+    for episode in reader.episodes(): ...
+    observations = reader.observations(np.random.randint(len(reader), size=256))
+    '''
+
+    def __init__(self, directory):
+        '''
+        :param directory: Directory where a TrajectoryRecorder stored its trajectories
+        '''
+        with open(os.path.join(directory, METADATA_FILE)) as metadata_file:
+            self.metadata = json.load(metadata_file)
+        self.env = RockPaperScissorsEngine(stacked_observations=self.metadata['stacked_observations'],
+                                        payoff_matrix=self.metadata['payoff_tensor'])
+        for column, (dtype, _) in COLUMNS.items():
+            setattr(self, column, memory_map(column_path(directory, column), dtype, column_shape(column, self.env.number_of_players)))
+        # Only whole episodes are ever written, so all step columns have the same length
+        self.number_of_steps = len(self.joint_actions)
+
+    def __len__(self):
+        return self.number_of_steps
+
+    @property
+    def number_of_episodes(self):
+        return len(self.episode_starts)
+
+    def episode(self, index):
+        '''
+        :param index: index of the episode
+        :returns: Episode of memory mapped views over the steps of the episode
+        '''
+        start = self.episode_starts[index]
+        stop  = self.episode_starts[index + 1] if index + 1 < self.number_of_episodes else self.number_of_steps
+        return Episode(self.joint_actions[start:stop], self.rewards[start:stop], self.state_hashes[start:stop])
+
+    def episodes(self, start=0, stop=None):
+        '''
+        Streams episodes in order
+        :param start: index of the first episode
+        :param stop: index after the last episode, defaults to the number of episodes
+        '''
+        for index in range(start, self.number_of_episodes if stop is None else stop):
+            yield self.episode(index)
+
+    def observations(self, step_indices, observation_mode='one_hot'):
+        '''
+        Rebuilds the observations following the given steps from the stored joint actions
+        :param step_indices: integer array of any shape indexing steps
+        :param observation_mode: 'one_hot', 'joint_action_indices' or 'state_hash', see RockPaperScissorsEngine.encode_observations
+        :returns: array of shape step_indices.shape + (stacked_observations, encoding_size) for
+                  'one_hot' observations, step_indices.shape + (stacked_observations,) for 'joint_action_indices' and step_indices.shape for 'state_hash'
+        '''
+        step_indices = np.asarray(step_indices)
+        episode_starts = self.episode_starts[np.searchsorted(self.episode_starts, step_indices, side='right') - 1]
+        recalled_steps = step_indices[..., np.newaxis] + np.arange(1 - self.env.stacked_observations, 1)
+        recalled = recalled_steps >= episode_starts[..., np.newaxis]
+        joint_actions = self.joint_actions[np.where(recalled, recalled_steps, step_indices[..., np.newaxis])]
+        joint_action_indices = np.where(recalled, self.env.encode_joint_actions(joint_actions), self.env.empty_action_index)
+        return self.env.encode_observations(joint_action_indices, observation_mode)
+
+
+def memory_map(path, dtype, shape):
+    '''
+    Read only memory map over the whole file in :param: path, as an array of rows of :param: shape
+    '''
+    row_size = dtype.itemsize * int(np.prod(shape))
+    number_of_rows = os.path.getsize(path) // row_size
+    if number_of_rows == 0: return np.empty((0,) + shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(number_of_rows,) + shape)
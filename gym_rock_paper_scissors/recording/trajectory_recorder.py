@@ -0,0 +1,102 @@
+import os
+import json
+
+import numpy as np
+import gym
+
+
+# Fixed width columns, each stored in its own file of raw little endian values.
+# Columns holding a value per player have one entry per player of the recorded env
+COLUMNS = {'joint_actions': (np.dtype('<i1'), True),   # Action of each player
+           'rewards':       (np.dtype('<f4'), True),   # Reward of each player
+           'state_hashes':  (np.dtype('<i4'), False),  # Hash of the state reached after the step
+           'episode_starts': (np.dtype('<i8'), False)} # Index of the first step of every episode
+METADATA_FILE = 'metadata.json'
+
+
+def column_path(directory, column):
+    return os.path.join(directory, column + '.bin')
+
+
+def column_shape(column, number_of_players):
+    '''
+    Shape of a single row of :param: column
+    '''
+    return (number_of_players,) if COLUMNS[column][1] else ()
+
+
+class TrajectoryRecorder(gym.Wrapper):
+    '''
+    Wraps a RockPaperScissorsEnv to append the joint actions, rewards and state hashes of every
+    episode to fixed width columnar files in :param: directory, which can be read back with a
+    TrajectoryReader. Observations are not stored, as they can be rebuilt from the joint actions.
+    Episodes are buffered in memory and written when they finish, when the env is reset, or on flush / close.
+    Recording into a directory which already contains trajectories appends new episodes to them.
+
+    Example usage:
+    env = TrajectoryRecorder(RockPaperScissorsEnv(), directory='trajectories')
+    '''
+
+    def __init__(self, env, directory):
+        '''
+        :param env: RockPaperScissorsEnv to record
+        :param directory: Directory where the trajectories are stored. Created if it does not exist
+        :throws ValueError: If the trajectories in :param: directory were recorded with a different env configuration
+        '''
+        super().__init__(env)
+        if env.unwrapped.state_space_size > np.iinfo(COLUMNS['state_hashes'][0]).max:
+            raise ValueError("State hashes of an env with stacked_observations={} do not fit in the state_hashes column".format(env.unwrapped.stacked_observations))
+        if env.unwrapped.action_space_size > np.iinfo(COLUMNS['joint_actions'][0]).max + 1:
+            raise ValueError("Actions of an env with {} actions do not fit in the joint_actions column".format(env.unwrapped.action_space_size))
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        metadata = {'stacked_observations': env.unwrapped.stacked_observations,
+                    'payoff_tensor': env.unwrapped.payoff_tensor.tolist()}
+        metadata_path = os.path.join(directory, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as metadata_file:
+                if json.load(metadata_file) != metadata:
+                    raise ValueError("Directory {} contains trajectories recorded with a different env configuration".format(directory))
+        else:
+            with open(metadata_path, 'w') as metadata_file:
+                json.dump(metadata, metadata_file)
+
+        self.files = {column: open(column_path(directory, column), 'ab') for column in COLUMNS}
+        self.number_of_steps = self.files['joint_actions'].tell() // (COLUMNS['joint_actions'][0].itemsize * env.unwrapped.number_of_players)
+        self.episode_joint_actions, self.episode_rewards, self.episode_state_hashes = [], [], []
+
+    def step(self, action):
+        observations, reward, done, info = self.env.step(action)
+        self.episode_joint_actions.append(np.array(action, dtype=COLUMNS['joint_actions'][0]))  # Copied, as callers may reuse action buffers
+        self.episode_rewards.append(reward)
+        self.episode_state_hashes.append(self.env.unwrapped.state_hash)
+        if done: self.flush()
+        return observations, reward, done, info
+
+    def reset(self, **kwargs):
+        self.flush()
+        return self.env.reset(**kwargs)
+
+    def flush(self):
+        '''
+        Writes the steps of the current episode, if any, and flushes the files
+        '''
+        if self.episode_joint_actions:
+            columns = {'joint_actions':  self.episode_joint_actions,
+                       'rewards':        self.episode_rewards,
+                       'state_hashes':   self.episode_state_hashes,
+                       'episode_starts': [self.number_of_steps]}
+            for column, values in columns.items():
+                np.asarray(values, dtype=COLUMNS[column][0]).tofile(self.files[column])
+            self.number_of_steps += len(self.episode_joint_actions)
+            self.episode_joint_actions, self.episode_rewards, self.episode_state_hashes = [], [], []
+        for recording_file in self.files.values():
+            recording_file.flush()
+
+    def close(self):
+        if not self.files['joint_actions'].closed:
+            self.flush()
+            for recording_file in self.files.values():
+                recording_file.close()
+        return self.env.close()
@@ -0,0 +1,3 @@
+from .env_server import EnvServer
+from .env_client import EnvClient
+from .wire_format import ALL_PLAYERS
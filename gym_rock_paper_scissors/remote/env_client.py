@@ -0,0 +1,137 @@
+import asyncio
+import socket
+
+import numpy as np
+
+from ..envs import RockPaperScissorsEngine
+from .wire_format import (MAGIC, ALL_PLAYERS, STEP, RESET, OK, CLIENT_HELLO, SERVER_HELLO,
+                          response_dtype, read_error)
+
+
+class EnvClient():
+    '''
+    Client of an EnvServer, which plays the consecutive games [first_game, first_game + number_of_games)
+    hosted by the server, either as one of their players or as all of them (player=ALL_PLAYERS).
+    Only actions are sent to the server, which replies with the state hash, rewards and done flag of
+    every game. Observations can be rebuilt from state hashes with observations(state_hashes).
+
+    Example usage:
+    client = await EnvClient.connect(path='/tmp/rock_paper_scissors.sock', number_of_games=64)
+    state_hashes, rewards, dones = await client.step(np.random.randint(0, 3, size=(64, 2)))
+    '''
+
+    def __init__(self, reader, writer, env, first_game, number_of_games, player):
+        '''
+        Use EnvClient.connect to connect to a server
+        :param env: RockPaperScissorsEngine with the configuration of the server's games
+        '''
+        self.reader, self.writer = reader, writer
+        self.env             = env
+        self.first_game      = first_game
+        self.number_of_games = number_of_games
+        self.player          = player
+        self.number_of_controlled_players = env.number_of_players if player == ALL_PLAYERS else 1
+        self.response_dtype  = response_dtype(self.number_of_controlled_players)
+        self.response_size   = number_of_games * self.response_dtype.itemsize
+
+    @classmethod
+    async def connect(cls, path=None, host=None, port=None, sock=None,
+                      first_game=0, number_of_games=1, player=ALL_PLAYERS):
+        '''
+        Connects to an EnvServer through a unix socket at :param: path, a TCP socket
+        at :param: host and :param: port, or an already connected socket :param: sock
+        :param first_game: index of the first game played by the client
+        :param number_of_games: number of consecutive games played by the client
+        :param player: player controlled by the client in every game, or ALL_PLAYERS
+        :throws ValueError: If the server refuses the connection, e.g. because the player is already taken
+        :returns: EnvClient
+        '''
+        if sock is not None: reader, writer = await asyncio.open_connection(sock=sock)
+        elif path is not None: reader, writer = await asyncio.open_unix_connection(path)
+        else: reader, writer = await asyncio.open_connection(host, port)
+        set_no_delay(writer)
+
+        writer.write(CLIENT_HELLO.pack(MAGIC, first_game, number_of_games, player))
+        status, = await reader.readexactly(1)
+        if status != OK:
+            message = await read_error(reader)
+            writer.close()
+            raise ValueError(message)
+        magic, number_of_players, action_space_size, stacked_observations, max_repetitions, _ = \
+            SERVER_HELLO.unpack(await reader.readexactly(SERVER_HELLO.size))
+        if magic != MAGIC:
+            writer.close()
+            raise ValueError("Unknown server protocol {}".format(magic))
+        payoff_tensor_shape = (action_space_size,) * number_of_players + (number_of_players,)
+        payoff_tensor = np.frombuffer(await reader.readexactly(8 * int(np.prod(payoff_tensor_shape))), dtype='<f8')
+        env = RockPaperScissorsEngine(stacked_observations=stacked_observations, max_repetitions=max_repetitions,
+                                   payoff_matrix=payoff_tensor.reshape(payoff_tensor_shape))
+        return cls(reader, writer, env, first_game, number_of_games, player)
+
+    async def step(self, actions):
+        '''
+        Plays a step on every game of the client. Resolves once every player of the games has taken its action
+        :param actions: integer array of shape (number_of_games, number_of_players) for clients controlling every
+                        player, or (number_of_games,) for clients controlling a single player
+        :throws ValueError: If :param: actions is invalid
+        :returns: (state_hashes, rewards, dones) arrays for every game. Rewards have shape (number_of_games,) for
+                  clients controlling a single player, and (number_of_games, number_of_players) otherwise.
+                  As in BatchedRockPaperScissorsEnv, finished games are automatically reset, and the
+                  state hash returned on their last step is the hash of their terminal state
+        '''
+        actions = np.asarray(actions)
+        if actions.size != self.number_of_games * self.number_of_controlled_players:
+            raise ValueError("Parameter actions should contain {} actions for each of the {} games"
+                             .format(self.number_of_controlled_players, self.number_of_games))
+        if np.any((actions < 0) | (actions >= self.env.action_space_size)):
+            raise ValueError("Every action should be an integer in [0, {})".format(self.env.action_space_size))
+        self.writer.write(bytes([STEP]) + actions.astype(np.uint8).tobytes())
+        await self.read_status()
+        records = np.frombuffer(await self.reader.readexactly(self.response_size), dtype=self.response_dtype)
+        rewards = records['rewards'] if self.player == ALL_PLAYERS else records['rewards'][:, 0]
+        return records['state_hash'], rewards, records['done'].astype(bool)
+
+    async def reset(self):
+        '''
+        Resets every game of the client. Only clients controlling every player can reset their games
+        :returns: state hashes of the initial state of every game
+        '''
+        self.writer.write(bytes([RESET]))
+        await self.read_status()
+        return np.zeros(self.number_of_games, dtype=np.int64)
+
+    async def read_status(self):
+        status, = await self.reader.readexactly(1)
+        if status != OK:
+            raise ValueError(await read_error(self.reader))
+
+    def observations(self, state_hashes, observation_mode='one_hot'):
+        '''
+        Rebuilds the observations of the states with hashes :param: state_hashes
+        :param observation_mode: 'one_hot', 'joint_action_indices' or 'state_hash', see RockPaperScissorsEngine.encode_observations
+        :returns: array of shape state_hashes.shape + (stacked_observations, encoding_size) for
+                  'one_hot' observations, state_hashes.shape + (stacked_observations,) for 'joint_action_indices' and state_hashes.shape for 'state_hash'
+        '''
+        return self.env.encode_observations(self.env.unhash_states(state_hashes), observation_mode)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+def set_no_delay(writer):
+    '''
+    Disables Nagle's algorithm on TCP sockets, so that small requests and responses are sent immediately
+    '''
+    sock = writer.get_extra_info('socket')
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
@@ -0,0 +1,253 @@
+import asyncio
+import socket
+from collections import namedtuple
+
+import numpy as np
+
+from ..envs import RockPaperScissorsEngine
+from .env_client import EnvClient, set_no_delay
+from .wire_format import (MAGIC, ALL_PLAYERS, STEP, RESET, OK, CLIENT_HELLO, SERVER_HELLO,
+                          response_dtype, encode_error)
+
+
+Waiter = namedtuple('Waiter', ['games', 'players', 'future'])
+
+
+class EnvServer():
+    '''
+    Hosts number_of_games repeated games of Rock Paper Scissors for clients connected through
+    unix sockets, TCP sockets or in-process socket pairs (see EnvClient and the wire_format module).
+    Every client plays a range of games, either as one of their players or as all of them.
+    Once every player of a game has sent its action, the game becomes ready, and all ready games
+    are stepped together in a single vectorized step on the next iteration of the event loop,
+    or after max_batch_delay seconds. Games are held as state hashes, so any subset of them
+    can be stepped independently (see RockPaperScissorsEngine.transition_state_hashes).
+
+    Example usage:
+    async with EnvServer(number_of_games=1024) as server:
+        await server.start_unix_server('/tmp/rock_paper_scissors.sock')
+        await server.serve_forever()
+    '''
+
+    def __init__(self, number_of_games=1024, env_kwargs=None, max_batch_delay=0.):
+        '''
+        :param number_of_games: Number of games hosted by the server
+        :param env_kwargs: Keyword arguments for the RockPaperScissorsEngine defining the games, e.g. stacked_observations.
+                           compiled=True turns every step into table lookups
+        :param max_batch_delay: Seconds to wait for more games to become ready before stepping
+                                a batch. Trades latency for larger batches
+        '''
+        if not isinstance(number_of_games, int) or number_of_games <= 0:
+            raise ValueError("Parameter number_of_games should be an integer greater than 0")
+        self.env = RockPaperScissorsEngine(**dict(env_kwargs or {}))
+        if self.env.action_space_size > np.iinfo(np.uint8).max or self.env.number_of_players >= ALL_PLAYERS:
+            raise ValueError("Games with more than 255 actions or 254 players cannot be served")
+        self.number_of_games = number_of_games
+        self.max_batch_delay = max_batch_delay
+
+        number_of_players = self.env.number_of_players
+        self.state_hashes    = np.zeros(number_of_games, dtype=np.int64)
+        self.repetitions     = np.zeros(number_of_games, dtype=np.int64)
+        self.pending_actions = np.zeros((number_of_games, number_of_players), dtype=np.int64)
+        self.submitted       = np.zeros((number_of_games, number_of_players), dtype=bool)
+        self.seats_taken     = np.zeros((number_of_games, number_of_players), dtype=bool)
+        # Outcome of the last step of every game, read by the clients waiting on it
+        self.last_state_hashes = np.zeros(number_of_games, dtype=np.int64)
+        self.last_rewards      = np.zeros((number_of_games, number_of_players), dtype=np.float32)
+        self.last_dones        = np.zeros(number_of_games, dtype=bool)
+
+        self.ready_games = []
+        self.waiters     = []
+        self.batch_scheduled = False
+        self.number_of_batches, self.number_of_steps = 0, 0
+
+        self.hello = bytes([OK]) + SERVER_HELLO.pack(MAGIC, number_of_players, self.env.action_space_size,
+                                                     self.env.stacked_observations, self.env.max_repetitions,
+                                                     number_of_games) + self.env.payoff_tensor.astype('<f8').tobytes()
+        self.servers, self.connections = [], set()
+
+    async def start_unix_server(self, path):
+        '''
+        Starts accepting clients on a unix socket at :param: path
+        '''
+        server = await asyncio.start_unix_server(self.handle_connection, path)
+        self.servers.append(server)
+        return server
+
+    async def start_tcp_server(self, host='127.0.0.1', port=0):
+        '''
+        Starts accepting clients on a TCP socket. Port 0 picks a free port,
+        which can be found in server.sockets[0].getsockname()
+        '''
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.servers.append(server)
+        return server
+
+    async def connect_local(self, first_game=0, number_of_games=1, player=ALL_PLAYERS):
+        '''
+        In-process stand-in for a remote connection, which serves a client over a socket pair
+        without touching the file system or the network
+        :returns: EnvClient, see EnvClient.connect
+        '''
+        server_socket, client_socket = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=server_socket)
+        connection = asyncio.ensure_future(self.handle_connection(reader, writer))
+        self.connections.add(connection)
+        connection.add_done_callback(self.connections.discard)
+        return await EnvClient.connect(sock=client_socket, first_game=first_game,
+                                       number_of_games=number_of_games, player=player)
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.serve_forever() for server in self.servers))
+
+    async def close(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        for connection in list(self.connections):
+            connection.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def handle_connection(self, reader, writer):
+        '''
+        Serves the requests of a single client until it disconnects
+        '''
+        set_no_delay(writer)
+        seats = None
+        try:
+            magic, first_game, number_of_games, player = CLIENT_HELLO.unpack(await reader.readexactly(CLIENT_HELLO.size))
+            error = self.validate_client(magic, first_game, number_of_games, player)
+            if error:
+                writer.write(encode_error(error))
+                return
+            games   = slice(first_game, first_game + number_of_games)
+            players = slice(None) if player == ALL_PLAYERS else slice(player, player + 1)
+            seats = (games, players)
+            self.seats_taken[seats] = True
+            writer.write(self.hello)
+
+            number_of_controlled_players = self.env.number_of_players if player == ALL_PLAYERS else 1
+            records = np.zeros(number_of_games, dtype=response_dtype(number_of_controlled_players))
+            step_size = number_of_games * number_of_controlled_players
+            while True:
+                opcode, = await reader.readexactly(1)
+                if opcode == STEP:
+                    actions = np.frombuffer(await reader.readexactly(step_size), dtype=np.uint8)
+                    error = self.submit(games, players, actions.reshape(number_of_games, number_of_controlled_players))
+                    if error:
+                        writer.write(encode_error(error))
+                    else:
+                        await self.wait_for_step(games, players)
+                        records['state_hash'] = self.last_state_hashes[games]
+                        records['rewards']    = self.last_rewards[seats]
+                        records['done']       = self.last_dones[games]
+                        writer.write(bytes([OK]) + records.tobytes())
+                elif opcode == RESET:
+                    if player != ALL_PLAYERS:
+                        writer.write(encode_error("Only clients controlling every player can reset their games"))
+                    else:
+                        self.reset_games(games)
+                        writer.write(bytes([OK]))
+                else:
+                    writer.write(encode_error("Unknown opcode {}".format(opcode)))
+                    return
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Client disconnected
+        finally:
+            if seats is not None: self.release_seats(seats)
+            writer.close()
+
+    def release_seats(self, seats):
+        '''
+        Frees the :param: seats of a disconnected client, and withdraws its pending actions.
+        Games which were already ready are skipped by step_ready_games until the seats are taken again
+        '''
+        self.seats_taken[seats] = False
+        self.submitted[seats]   = False
+
+    def validate_client(self, magic, first_game, number_of_games, player):
+        '''
+        :returns: error message if the client cannot be accepted, None otherwise
+        '''
+        if magic != MAGIC:
+            return "Unknown client protocol {}".format(magic)
+        if number_of_games == 0 or first_game + number_of_games > self.number_of_games:
+            return "Games [{}, {}) are not in [0, {})".format(first_game, first_game + number_of_games, self.number_of_games)
+        if player != ALL_PLAYERS and player >= self.env.number_of_players:
+            return "Player {} does not exist in a game of {} players".format(player, self.env.number_of_players)
+        players = slice(None) if player == ALL_PLAYERS else slice(player, player + 1)
+        if self.seats_taken[first_game:first_game + number_of_games, players].any():
+            return "Player {} of games [{}, {}) is already taken by another client".format(player, first_game, first_game + number_of_games)
+        return None
+
+    def submit(self, games, players, actions):
+        '''
+        Records the actions of a client, and schedules the games in which every player has taken its action
+        :returns: error message if the actions are invalid, None otherwise
+        '''
+        if np.any(actions >= self.env.action_space_size):
+            return "Every action should be an integer in [0, {})".format(self.env.action_space_size)
+        self.pending_actions[games, players] = actions
+        self.submitted[games, players] = True
+        ready = self.submitted[games].all(axis=1)
+        if ready.any():
+            self.ready_games.append(np.flatnonzero(ready) + games.start)
+            if not self.batch_scheduled:
+                self.batch_scheduled = True
+                loop = asyncio.get_running_loop()
+                if self.max_batch_delay > 0: loop.call_later(self.max_batch_delay, self.step_ready_games)
+                else: loop.call_soon(self.step_ready_games)
+        return None
+
+    async def wait_for_step(self, games, players):
+        '''
+        Waits until the games of a client, on which it has taken its actions, have been stepped
+        '''
+        if not self.submitted[games, players].any(): return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(Waiter(games, players, future))
+        await future
+
+    def step_ready_games(self):
+        '''
+        Steps every ready game in a single batch, and wakes up the clients whose games have all been stepped
+        '''
+        self.batch_scheduled = False
+        # A game is listed twice if a client disconnected and another one retook its seats before the step.
+        # Games whose actions were withdrawn by a disconnected client are skipped
+        games = np.unique(np.concatenate(self.ready_games))
+        self.ready_games = []
+        games = games[self.submitted[games].all(axis=1)]
+
+        joint_action_indices = self.env.encode_joint_actions(self.pending_actions[games])
+        next_state_hashes = self.env.transition_state_hashes(self.state_hashes[games], joint_action_indices)
+        repetitions = self.repetitions[games] + 1
+        dones = repetitions == self.env.max_repetitions
+        self.last_state_hashes[games] = next_state_hashes
+        self.last_rewards[games]      = self.env.joint_action_rewards[joint_action_indices]
+        self.last_dones[games]        = dones
+        # Finished games are automatically reset, as in BatchedRockPaperScissorsEnv
+        self.state_hashes[games] = np.where(dones, 0, next_state_hashes)
+        self.repetitions[games]  = np.where(dones, 0, repetitions)
+        self.submitted[games]    = False
+        self.number_of_batches += 1
+        self.number_of_steps   += len(games)
+
+        waiters, self.waiters = self.waiters, []
+        for waiter in waiters:
+            if self.submitted[waiter.games, waiter.players].any(): self.waiters.append(waiter)
+            elif not waiter.future.done(): waiter.future.set_result(None)
+
+    def reset_games(self, games):
+        '''
+        Resets the games :param: games to their initial state
+        '''
+        self.state_hashes[games] = 0
+        self.repetitions[games]  = 0
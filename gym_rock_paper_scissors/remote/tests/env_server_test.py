@@ -0,0 +1,129 @@
+import asyncio
+
+import numpy as np
+import pytest
+from .. import EnvServer, EnvClient, ALL_PLAYERS
+from ...envs import BatchedRockPaperScissorsEnv
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+@pytest.mark.parametrize('env_kwargs', [{}, {'compiled': True}, {'number_of_players': 3, 'stacked_observations': 2}])
+def test_client_controlling_every_player_matches_batched_env(env_kwargs):
+    async def play():
+        env_kwargs.update(max_repetitions=4)
+        batched_env = BatchedRockPaperScissorsEnv(num_envs=8, **env_kwargs)
+        batched_env.reset()
+        rng = np.random.RandomState(0)
+        async with EnvServer(number_of_games=16, env_kwargs=env_kwargs) as server:
+            async with await server.connect_local(first_game=8, number_of_games=8) as client:
+                for _ in range(10):
+                    actions = rng.randint(0, 3, size=(8, batched_env.number_of_players))
+                    state_hashes, rewards, dones = await client.step(actions)
+                    observations, expected_rewards, expected_dones, info = batched_env.step(actions)
+                    np.testing.assert_array_equal(state_hashes, info['state_hash'])
+                    np.testing.assert_array_equal(rewards, expected_rewards)
+                    np.testing.assert_array_equal(dones, expected_dones)
+                    np.testing.assert_array_equal(client.observations(state_hashes), observations[:, 0])
+    run(play())
+
+
+def test_clients_controlling_one_player_each_play_together():
+    async def play(client, actions):
+        return [await client.step(actions) for _ in range(3)]
+
+    async def play_together():
+        async with EnvServer(number_of_games=4) as server:
+            rock_client     = await server.connect_local(number_of_games=4, player=0)
+            scissors_client = await server.connect_local(number_of_games=4, player=1)
+            rock_results, scissors_results = await asyncio.gather(play(rock_client, np.zeros(4)),
+                                                                  play(scissors_client, np.full(4, 2)))
+            assert server.number_of_steps == 12
+            for (rock_hashes, rock_rewards, _), (scissors_hashes, scissors_rewards, _) in zip(rock_results, scissors_results):
+                np.testing.assert_array_equal(rock_hashes, scissors_hashes)
+                np.testing.assert_array_equal(rock_rewards, 1)
+                np.testing.assert_array_equal(scissors_rewards, -1)
+            await rock_client.close()
+            await scissors_client.close()
+    run(play_together())
+
+
+def test_ready_games_are_stepped_in_a_single_batch():
+    async def play():
+        async with EnvServer(number_of_games=64) as server:
+            clients = [await server.connect_local(first_game=i, number_of_games=1) for i in range(64)]
+            for _ in range(5):
+                await asyncio.gather(*(client.step([[0, 1]]) for client in clients))
+            assert server.number_of_steps == 64 * 5
+            assert server.number_of_batches < 64 * 5
+            for client in clients: await client.close()
+    run(play())
+
+
+def test_unix_socket_server(tmp_path):
+    async def play():
+        path = str(tmp_path / 'env.sock')
+        async with EnvServer(number_of_games=2, env_kwargs={'stacked_observations': 2}) as server:
+            await server.start_unix_server(path)
+            async with await EnvClient.connect(path=path, number_of_games=2) as client:
+                assert client.env.stacked_observations == 2
+                state_hashes, rewards, _ = await client.step([[1, 2], [2, 2]])
+                np.testing.assert_array_equal(rewards, [[-1, 1], [0, 0]])
+                np.testing.assert_array_equal(client.observations(state_hashes, 'joint_action_indices'), [[9, 5], [9, 8]])
+                np.testing.assert_array_equal(await client.reset(), 0)
+                state_hashes, _, _ = await client.step([[0, 0], [0, 0]])
+                np.testing.assert_array_equal(state_hashes, 1)
+    run(play())
+
+
+def test_tcp_server():
+    async def play():
+        async with EnvServer(number_of_games=1) as server:
+            tcp_server = await server.start_tcp_server()
+            host, port = tcp_server.sockets[0].getsockname()[:2]
+            async with await EnvClient.connect(host=host, port=port) as client:
+                _, rewards, _ = await client.step([[0, 2]])
+                np.testing.assert_array_equal(rewards, [[1, -1]])
+    run(play())
+
+
+def test_invalid_requests_raise_value_error():
+    async def play():
+        async with EnvServer(number_of_games=2) as server:
+            client = await server.connect_local(number_of_games=2, player=0)
+            with pytest.raises(ValueError):
+                await server.connect_local(first_game=1, number_of_games=1, player=0)
+            with pytest.raises(ValueError):
+                await server.connect_local(first_game=1, number_of_games=2, player=1)
+            with pytest.raises(ValueError):
+                await server.connect_local(player=2)
+            with pytest.raises(ValueError):
+                await client.step([0, 3])
+            with pytest.raises(ValueError):
+                await client.reset()
+            await client.close()
+            await asyncio.sleep(0.01)
+            # Seats are released when clients disconnect
+            await (await server.connect_local(number_of_games=2, player=ALL_PLAYERS)).close()
+    run(play())
+
+
+def test_ready_games_of_disconnected_clients_are_not_stepped():
+    async def play():
+        async with EnvServer(number_of_games=2) as server:
+            seats = (slice(0, 2), slice(None))
+            server.seats_taken[seats] = True
+            server.submit(*seats, np.array([[0, 1], [2, 2]]))
+            assert len(server.ready_games) == 1
+            server.release_seats(seats)  # The client disconnects before its games are stepped
+            await asyncio.sleep(0)
+            assert server.number_of_steps == 0
+            np.testing.assert_array_equal(server.state_hashes, 0)
+            # The games can still be played by another client
+            async with await server.connect_local(number_of_games=2) as client:
+                _, rewards, _ = await client.step([[0, 1], [2, 2]])
+                np.testing.assert_array_equal(rewards, [[-1, 1], [0, 0]])
+            assert server.number_of_steps == 2
+    run(play())
@@ -0,0 +1,52 @@
+'''
+Binary protocol between EnvServer and EnvClient. Every integer and float is little endian.
+
+Handshake:
+    client -> server: CLIENT_HELLO (magic, first_game, number_of_games, player)
+    server -> client: status byte, followed on OK by SERVER_HELLO (magic, number_of_players,
+                      action_space_size, stacked_observations, max_repetitions, number_of_games)
+                      and the payoff tensor as float64 values
+
+Requests, each one an opcode byte followed by its payload:
+    STEP:  one uint8 action per game and controlled player, of shape (number_of_games, number_of_controlled_players)
+    RESET: no payload
+Responses, each one a status byte followed on OK by:
+    STEP:  one response_dtype record per game
+    RESET: no payload
+Errors are a status byte followed by the length of the error message (uint16) and the utf-8 encoded message.
+'''
+import struct
+
+import numpy as np
+
+
+MAGIC = b'RPS\x01'
+ALL_PLAYERS = 255  # Player of a client which takes the actions of every player of its games
+
+STEP, RESET = 0, 1
+OK, ERROR = 0, 1
+
+CLIENT_HELLO  = struct.Struct('<4sIIB')
+SERVER_HELLO  = struct.Struct('<4sBBHII')
+ERROR_MESSAGE = struct.Struct('<H')
+
+
+def response_dtype(number_of_rewards):
+    '''
+    Record sent for every game on each step
+    :param number_of_rewards: 1 for clients controlling a single player, number_of_players otherwise
+    '''
+    return np.dtype([('state_hash', '<i8'), ('rewards', '<f4', (number_of_rewards,)), ('done', 'u1')])
+
+
+def encode_error(message):
+    encoded_message = message.encode('utf-8')[:2**16 - 1]
+    return bytes([ERROR]) + ERROR_MESSAGE.pack(len(encoded_message)) + encoded_message
+
+
+async def read_error(reader):
+    '''
+    Reads the message of an error response whose status byte has already been read
+    '''
+    length, = ERROR_MESSAGE.unpack(await reader.readexactly(ERROR_MESSAGE.size))
+    return (await reader.readexactly(length)).decode('utf-8')
@@ -0,0 +1 @@
+from .rollout_runner import RolloutRunner, RolloutBatch
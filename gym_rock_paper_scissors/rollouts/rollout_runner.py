@@ -0,0 +1,187 @@
+import os
+import traceback
+import multiprocessing
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..envs import BatchedRockPaperScissorsEngine
+from ..fixed_agents import MixedStrategyPopulation
+
+
+RolloutBatch = namedtuple('RolloutBatch', ['observations', 'actions', 'rewards', 'dones', 'last_observations'])
+RolloutBatch.__doc__ = '''
+Trajectories of every game collected by RolloutRunner.rollout. Entries are indexed by [timestep, game]:
+observations[t] are the observations on which actions[t] were taken, which yielded rewards[t] and dones[t].
+last_observations are the observations following the last timestep of the rollout.
+'''
+
+
+class RolloutRunner():
+    '''
+    Plays num_envs games of Rock Paper Scissors between MixedStrategyAgents across a pool of
+    worker processes. Each worker steps a BatchedRockPaperScissorsEngine holding a shard of the games,
+    and writes observations, actions, rewards and dones directly into arrays in shared memory,
+    so no observation is ever pickled between processes.
+    Game i is played by player_1_agents[i % len(player_1_agents)] against player_2_agents[i % len(player_2_agents)].
+    Games continue across rollouts, and are automatically reset by the environment when finished.
+
+    Example usage:
+    with RolloutRunner([randomAgent], fixedAgents, num_envs=4096, num_workers=4, seed=0) as runner:
+        batch = runner.rollout()
+    '''
+
+    def __init__(self, player_1_agents, player_2_agents, num_envs=1024, num_workers=None,
+                 rollout_length=128, seed=None, env_kwargs=None, start_method=None):
+        '''
+        :param player_1_agents: list of MixedStrategyAgents playing as the first player
+        :param player_2_agents: list of MixedStrategyAgents playing as the second player
+        :param num_envs: Total number of games played in parallel
+        :param num_workers: Number of worker processes. Defaults to the number of CPUs
+        :param rollout_length: Number of steps played by every game on each rollout
+        :param seed: Seed from which every worker derives its own independent random number generators.
+                     Rollouts are reproducible for a given seed, num_envs and num_workers
+        :param env_kwargs: Keyword arguments for BatchedRockPaperScissorsEngine, except num_envs.
+                           Compact observation modes greatly reduce the size of the shared observation buffer
+        :param start_method: multiprocessing start method, defaults to the platform's default
+        '''
+        num_workers = os.cpu_count() if num_workers is None else num_workers
+        if not isinstance(num_envs, int) or not isinstance(num_workers, int) or not 0 < num_workers <= num_envs:
+            raise ValueError("Parameters num_envs and num_workers should be integers, with 0 < num_workers <= num_envs")
+        if not isinstance(rollout_length, int) or rollout_length <= 0:
+            raise ValueError("Parameter rollout_length should be an integer greater than 0")
+        if len(player_1_agents) == 0 or len(player_2_agents) == 0:
+            raise ValueError("Both players should have at least one agent")
+
+        self.num_envs       = num_envs
+        self.num_workers    = num_workers
+        self.rollout_length = rollout_length
+        self.env_kwargs     = dict(env_kwargs or {})
+
+        env = BatchedRockPaperScissorsEngine(num_envs=1, **self.env_kwargs)
+        if env.number_of_players != 2:
+            raise ValueError("RolloutRunner only supports two player games. Given env with {} players".format(env.number_of_players))
+        observation = env.reset()[0]
+        observation_shape = observation.shape
+        self.array_specs = {'observations':      ((rollout_length, num_envs) + observation_shape, observation.dtype),
+                            'actions':           ((rollout_length, num_envs, 2), np.int8),
+                            'rewards':           ((rollout_length, num_envs, 2), np.float64),
+                            'dones':             ((rollout_length, num_envs), np.bool_),
+                            'last_observations': ((num_envs,) + observation_shape, observation.dtype)}
+        self.shared_memories = {name: shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                                for name, (shape, dtype) in self.array_specs.items()}
+        self.arrays = attach_shared_arrays(self.shared_memories, self.array_specs)
+
+        context = multiprocessing.get_context(start_method)
+        shard_boundaries = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        worker_seeds     = np.random.SeedSequence(seed).spawn(num_workers)
+        shared_memory_names = {name: shm.name for name, shm in self.shared_memories.items()}
+        self.connections, self.workers = [], []
+        self.closed = False
+        try:
+            for start, stop, worker_seed in zip(shard_boundaries[:-1], shard_boundaries[1:], worker_seeds):
+                parent_connection, worker_connection = context.Pipe()
+                self.connections.append(parent_connection)
+                worker = context.Process(target=rollout_worker, daemon=True,
+                                         args=(worker_connection, shared_memory_names, self.array_specs, rollout_length, int(start), int(stop),
+                                               self.env_kwargs, player_1_agents, player_2_agents, worker_seed))
+                try:
+                    worker.start()
+                finally:
+                    worker_connection.close()
+                self.workers.append(worker)
+        except BaseException:
+            # Stops the workers already started and unlinks the shared memory, which would otherwise leak
+            for connection in self.connections[len(self.workers):]: connection.close()
+            self.connections = self.connections[:len(self.workers)]
+            self.close()
+            raise
+
+    def rollout(self):
+        '''
+        Plays rollout_length steps on every game
+        :returns: RolloutBatch of arrays backed by shared memory, which are
+                  overwritten by the next rollout. Copy them to keep them around
+        '''
+        if self.closed:
+            raise RuntimeError("Cannot rollout on a closed RolloutRunner")
+        for connection in self.connections:
+            connection.send('rollout')
+        errors = [response for response in map(receive_worker_response, self.connections) if response != 'done']
+        if errors:
+            raise RuntimeError("Rollout worker failed:\n{}".format(errors[0]))
+        return RolloutBatch(**self.arrays)
+
+    def close(self):
+        '''
+        Stops the worker processes and releases the shared memory
+        '''
+        if self.closed: return
+        self.closed = True
+        for connection, worker in zip(self.connections, self.workers):
+            if worker.is_alive(): connection.send('close')
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.arrays = None
+        for shm in self.shared_memories.values():
+            try:
+                shm.close()
+            except BufferError:
+                pass  # Arrays from the last RolloutBatch are still referenced, the memory is released with them
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def receive_worker_response(connection):
+    try:
+        return connection.recv()
+    except EOFError:
+        return 'Worker process exited unexpectedly'
+
+
+def attach_shared_arrays(shared_memories, array_specs):
+    return {name: np.ndarray(shape, dtype=dtype, buffer=shared_memories[name].buf)
+            for name, (shape, dtype) in array_specs.items()}
+
+
+def rollout_worker(connection, shared_memory_names, array_specs, rollout_length, start, stop, env_kwargs,
+                   player_1_agents, player_2_agents, seed_sequence):
+    '''
+    Steps the games in [start, stop) whenever a 'rollout' command is received,
+    writing the trajectories into the shared arrays, until 'close' is received
+    '''
+    shared_memories = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in shared_memory_names.items()}
+    arrays = attach_shared_arrays(shared_memories, array_specs)
+    try:
+        env = BatchedRockPaperScissorsEngine(num_envs=stop - start, **env_kwargs)
+        player_1_seed, player_2_seed = seed_sequence.spawn(2)
+        player_1_population = MixedStrategyPopulation(player_1_agents, seed=player_1_seed)
+        player_2_population = MixedStrategyPopulation(player_2_agents, seed=player_2_seed)
+        player_1_indices = np.arange(start, stop) % len(player_1_agents)
+        player_2_indices = np.arange(start, stop) % len(player_2_agents)
+        observations = env.reset()
+        while connection.recv() == 'rollout':
+            try:
+                for t in range(rollout_length):
+                    actions = np.stack([player_1_population.sample_actions(player_1_indices),
+                                        player_2_population.sample_actions(player_2_indices)], axis=1)
+                    arrays['observations'][t, start:stop] = observations
+                    arrays['actions'][t, start:stop]      = actions
+                    observations, rewards, dones, _ = env.step(actions)
+                    arrays['rewards'][t, start:stop] = rewards
+                    arrays['dones'][t, start:stop]   = dones
+                arrays['last_observations'][start:stop] = observations
+                connection.send('done')
+            except Exception:
+                connection.send(traceback.format_exc())
+    finally:
+        arrays = None
+        for shm in shared_memories.values():
+            shm.close()
@@ -0,0 +1,85 @@
+import os
+import sys
+import subprocess
+
+import numpy as np
+import pytest
+from .. import RolloutRunner
+from ...envs import RockPaperScissorsEnv
+from ...fixed_agents import MixedStrategyAgent, rockAgent, paperAgent, scissorsAgent, randomAgent, fixedAgents
+
+
+def test_rollouts_follow_game_rules():
+    max_repetitions, rollout_length = 4, 6
+    with RolloutRunner([rockAgent, randomAgent], fixedAgents, num_envs=10, num_workers=3, rollout_length=rollout_length,
+                       seed=0, env_kwargs={'max_repetitions': max_repetitions}) as runner:
+        batch = runner.rollout()
+        env = RockPaperScissorsEnv(max_repetitions=max_repetitions)
+
+        assert batch.observations.shape == (rollout_length, 10, 2, 3, 10)
+        np.testing.assert_array_equal(batch.observations[0], np.broadcast_to(env.reset(), (10, 2, 3, 10)))
+        np.testing.assert_array_equal(batch.actions[:, 0::2, 0], 0)  # Games played by rockAgent
+        np.testing.assert_array_equal(batch.actions[:, 0::4, 1], 0)  # Games played against rockAgent
+        np.testing.assert_array_equal(batch.actions[:, 1::4, 1], 1)  # Games played against paperAgent
+        np.testing.assert_array_equal(batch.rewards, env.rewards(batch.actions))
+        np.testing.assert_array_equal(batch.dones, np.broadcast_to((np.arange(rollout_length) % max_repetitions == max_repetitions - 1)[:, np.newaxis], (rollout_length, 10)))
+
+        # Games continue from where the previous rollout stopped
+        last_observations = batch.last_observations.copy()
+        batch = runner.rollout()
+        np.testing.assert_array_equal(batch.observations[0], last_observations)
+
+
+def test_rollouts_are_reproducible_for_a_given_seed():
+    def collect(seed):
+        with RolloutRunner([randomAgent], [randomAgent], num_envs=8, num_workers=2, rollout_length=5, seed=seed,
+                           env_kwargs={'observation_mode': 'state_hash'}) as runner:
+            return [np.copy(array) for array in runner.rollout()]
+    for array_1, array_2 in zip(collect(seed=1), collect(seed=1)):
+        np.testing.assert_array_equal(array_1, array_2)
+    assert not np.array_equal(collect(seed=1)[1], collect(seed=2)[1])
+
+
+def test_closed_runner_cannot_rollout():
+    runner = RolloutRunner([paperAgent], [scissorsAgent], num_envs=2, num_workers=1, rollout_length=2)
+    runner.close()
+    with pytest.raises(RuntimeError):
+        runner.rollout()
+
+
+def test_invalid_worker_configuration_raises_value_error():
+    with pytest.raises(ValueError):
+        RolloutRunner([randomAgent], [randomAgent], num_envs=2, num_workers=3)
+
+
+def test_rollouts_do_not_import_gym():
+    code = ('import sys\n'
+            'from gym_rock_paper_scissors.rollouts import RolloutRunner\n'
+            'from gym_rock_paper_scissors.fixed_agents import randomAgent\n'
+            'with RolloutRunner([randomAgent], [randomAgent], num_envs=2, num_workers=1, rollout_length=3, seed=0) as runner:\n'
+            '    runner.rollout()\n'
+            "print('gym' in sys.modules)")
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    output = subprocess.run([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=package_root),
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
+
+
+def test_shared_memory_is_released_when_workers_fail_to_start(monkeypatch):
+    from multiprocessing import shared_memory
+    from .. import rollout_runner
+    created_names = []
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get('create'): created_names.append(self.name)
+    monkeypatch.setattr(rollout_runner.shared_memory, 'SharedMemory', RecordingSharedMemory)
+
+    unpicklable_agent = MixedStrategyAgent(support_vector=[1, 0, 0], name='Unpicklable')
+    unpicklable_agent.callback = lambda: None
+    with pytest.raises(Exception):
+        RolloutRunner([unpicklable_agent], [randomAgent], num_envs=2, num_workers=1, start_method='spawn')
+    assert len(created_names) == 5
+    for name in created_names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1 @@
+from .round_robin_tournament import round_robin_tournament, TournamentResults
@@ -0,0 +1,152 @@
+import copy
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from ..envs import RockPaperScissorsEngine, BatchedRockPaperScissorsEngine
+from ..fixed_agents import MixedStrategyAgent
+
+
+TournamentResults = namedtuple('TournamentResults', ['names', 'payoffs', 'payoff_confidence_intervals',
+                                                     'win_rates', 'draw_rates', 'win_rate_confidence_intervals', 'exact'])
+TournamentResults.__doc__ = '''
+Cross play results of a round robin tournament. Every matrix is indexed by [i, j], where
+agent i plays as the first player against agent j as the second player:
+    - payoffs: expected cumulative reward of agent i over an episode
+    - win_rates / draw_rates: probability that agent i's cumulative reward is greater than / equal to agent j's
+    - *_confidence_intervals: [i, j, (lower, upper)] bounds of the estimates
+    - exact: whether the pairing was computed analytically, in which case its confidence intervals have zero width
+'''
+
+
+def round_robin_tournament(agents, episodes=1000, env_kwargs=None, num_workers=1, confidence=0.95, seed=None):
+    '''
+    Plays every agent against every other agent, including itself, in both player positions.
+    Pairings between two MixedStrategyAgents are computed exactly from their support vectors
+    and the environment's payoff tensor, without simulation. Any other pairing is estimated
+    by playing :param: episodes episodes in a BatchedRockPaperScissorsEngine.
+    :param agents: list of agents implementing take_action(state), and optionally the batched take_actions(states)
+    :param episodes: Number of episodes simulated for each pairing which cannot be computed exactly
+    :param env_kwargs: Keyword arguments for the environment, e.g. max_repetitions or payoffs
+    :param num_workers: Number of processes over which simulated pairings are distributed.
+                        Agents need to be picklable when greater than 1
+    :param confidence: Confidence level of the confidence intervals of simulated pairings
+    :param seed: Seed from which every simulated pairing derives independent random number generators for
+                 its copies of the agents. Results are reproducible for a given seed, regardless of num_workers
+    :returns: TournamentResults
+    '''
+    env_kwargs = dict(env_kwargs or {})
+    env = RockPaperScissorsEngine(**env_kwargs)
+    if env.number_of_players != 2:
+        raise ValueError("Round robin tournaments are played between pairs of agents. Given env with {} players".format(env.number_of_players))
+    number_of_agents = len(agents)
+    payoffs, win_rates, draw_rates = (np.zeros((number_of_agents, number_of_agents)) for _ in range(3))
+    payoff_confidence_intervals, win_rate_confidence_intervals = (np.zeros((number_of_agents, number_of_agents, 2)) for _ in range(2))
+    exact = np.zeros((number_of_agents, number_of_agents), dtype=bool)
+
+    pairings = [(i, j) for i in range(number_of_agents) for j in range(number_of_agents)]
+    simulated_pairings = []
+    for i, j in pairings:
+        if isinstance(agents[i], MixedStrategyAgent) and isinstance(agents[j], MixedStrategyAgent):
+            payoff, win_rate, draw_rate = expected_mixed_strategy_outcome(agents[i].support_vector, agents[j].support_vector,
+                                                                          env.payoff_tensor, env.max_repetitions)
+            payoffs[i, j], win_rates[i, j], draw_rates[i, j], exact[i, j] = payoff, win_rate, draw_rate, True
+            payoff_confidence_intervals[i, j]   = payoff
+            win_rate_confidence_intervals[i, j] = win_rate
+        else:
+            simulated_pairings.append((i, j))
+
+    pairing_seeds = np.random.SeedSequence(seed).spawn(len(simulated_pairings))
+    simulation_arguments = [(agents[i], agents[j], episodes, env_kwargs, pairing_seed)
+                            for (i, j), pairing_seed in zip(simulated_pairings, pairing_seeds)]
+    if num_workers > 1 and len(simulated_pairings) > 1:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            episode_returns = list(executor.map(simulate_pairing, *zip(*simulation_arguments)))
+    else:
+        episode_returns = [simulate_pairing(*arguments) for arguments in simulation_arguments]
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    for (i, j), returns in zip(simulated_pairings, episode_returns):
+        payoffs[i, j] = returns[:, 0].mean()
+        standard_error = returns[:, 0].std(ddof=1) / np.sqrt(episodes) if episodes > 1 else np.inf
+        payoff_confidence_intervals[i, j] = payoffs[i, j] + np.array([-z, z]) * standard_error
+        wins = np.count_nonzero(returns[:, 0] > returns[:, 1])
+        win_rates[i, j]  = wins / episodes
+        draw_rates[i, j] = np.count_nonzero(returns[:, 0] == returns[:, 1]) / episodes
+        win_rate_confidence_intervals[i, j] = wilson_interval(wins, episodes, z)
+
+    return TournamentResults(names=[getattr(agent, 'name', str(agent)) for agent in agents], payoffs=payoffs,
+                             payoff_confidence_intervals=payoff_confidence_intervals, win_rates=win_rates,
+                             draw_rates=draw_rates, win_rate_confidence_intervals=win_rate_confidence_intervals, exact=exact)
+
+
+def expected_mixed_strategy_outcome(support_vector_1, support_vector_2, payoff_tensor, repetitions):
+    '''
+    Computes the exact outcome of an episode between two mixed strategies
+    :param support_vector_1: support vector of the first player
+    :param support_vector_2: support vector of the second player
+    :param payoff_tensor: (number_of_actions, number_of_actions, 2) payoff tensor of the environment
+    :param repetitions: Number of rounds in an episode
+    :returns: (expected cumulative reward of the first player, probability that the first player
+               obtains a greater cumulative reward than the second player, probability of a draw)
+    '''
+    joint_probabilities = np.outer(support_vector_1, support_vector_2).ravel()
+    expected_payoff = repetitions * joint_probabilities @ payoff_tensor[..., 0].ravel()
+
+    # Distribution of the difference between both players' cumulative rewards, convolved round by round
+    round_differences = (payoff_tensor[..., 0] - payoff_tensor[..., 1]).ravel()
+    differences, probabilities = np.zeros(1), np.ones(1)
+    for _ in range(repetitions):
+        differences   = np.round((differences[:, np.newaxis] + round_differences).ravel(), decimals=9)
+        probabilities = (probabilities[:, np.newaxis] * joint_probabilities).ravel()
+        differences, inverse = np.unique(differences, return_inverse=True)
+        probabilities = np.bincount(inverse.ravel(), weights=probabilities)
+    return expected_payoff, probabilities[differences > 0].sum(), probabilities[differences == 0].sum()
+
+
+def simulate_pairing(player_1_agent, player_2_agent, episodes, env_kwargs, seed_sequence):
+    '''
+    Plays :param: episodes episodes between copies of two agents in a BatchedRockPaperScissorsEngine
+    :param seed_sequence: SeedSequence from which the random number generators of the copies are spawned
+    :returns: (episodes, 2) array containing the cumulative reward of each player on every episode
+    '''
+    player_1_seed, player_2_seed = seed_sequence.spawn(2)
+    player_1_agent, player_2_agent = seeded_copy(player_1_agent, player_1_seed), seeded_copy(player_2_agent, player_2_seed)
+    env = BatchedRockPaperScissorsEngine(num_envs=episodes, **env_kwargs)
+    observations = env.reset()
+    episode_returns = np.zeros((episodes, 2))
+    for _ in range(env.max_repetitions):
+        actions = np.stack([take_actions(player_1_agent, observations[:, 0]),
+                            take_actions(player_2_agent, observations[:, 1])], axis=1)
+        observations, rewards, _, _ = env.step(actions)
+        episode_returns += rewards
+    return episode_returns
+
+
+def seeded_copy(agent, seed_sequence):
+    '''
+    Copy of :param: agent whose random number generator, if it keeps a np.random.Generator in its rng attribute,
+    is seeded from :param: seed_sequence. Simulations then neither consume the RNGs of the caller's agents
+    nor replay the same random actions in every pairing
+    '''
+    agent = copy.deepcopy(agent)
+    if isinstance(getattr(agent, 'rng', None), np.random.Generator): agent.rng = np.random.default_rng(seed_sequence)
+    return agent
+
+
+def take_actions(agent, observations):
+    if hasattr(agent, 'take_actions'): return np.asarray(agent.take_actions(observations))
+    return np.array([agent.take_action(observation) for observation in observations])
+
+
+def wilson_interval(successes, trials, z):
+    '''
+    Wilson score interval for a binomial proportion
+    '''
+    proportion = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (proportion + z**2 / (2 * trials)) / denominator
+    half_width = z * np.sqrt(proportion * (1 - proportion) / trials + z**2 / (4 * trials**2)) / denominator
+    return np.array([center - half_width, center + half_width])
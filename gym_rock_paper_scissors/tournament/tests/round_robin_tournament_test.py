@@ -0,0 +1,69 @@
+import numpy as np
+from .. import round_robin_tournament
+from ...fixed_agents import MixedStrategyAgent, rockAgent, paperAgent, scissorsAgent, randomAgent
+
+
+class SequentialAgent():
+    '''
+    Non MixedStrategyAgent which samples actions one at a time from a support vector
+    '''
+    def __init__(self, support_vector, name, seed=0):
+        self.support_vector = support_vector
+        self.name = name
+        self.rng = np.random.default_rng(seed)
+
+    def take_action(self, state):
+        return self.rng.choice(3, p=self.support_vector)
+
+
+def test_pure_strategies_have_exact_deterministic_outcomes():
+    results = round_robin_tournament([rockAgent, paperAgent, scissorsAgent], env_kwargs={'max_repetitions': 5})
+    assert results.names == ['RockAgent', 'PaperAgent', 'ScissorsAgent']
+    assert results.exact.all()
+    np.testing.assert_array_equal(results.payoffs, 5 * np.array([[0, -1, 1], [1, 0, -1], [-1, 1, 0]]))
+    np.testing.assert_array_equal(results.win_rates, [[0, 0, 1], [1, 0, 0], [0, 1, 0]])
+    np.testing.assert_array_equal(results.draw_rates, np.eye(3))
+    np.testing.assert_array_equal(results.payoff_confidence_intervals[..., 0], results.payoffs)
+
+
+def test_exact_outcomes_use_environment_payoffs():
+    biased_agent = MixedStrategyAgent(support_vector=[0.5, 0.5, 0], name='Biased')
+    results = round_robin_tournament([biased_agent, randomAgent], env_kwargs={'max_repetitions': 1, 'payoff_rock_vs_scissors': 3})
+    # Biased vs random: rock beats scissors (+3) and loses to paper (-1), paper beats rock (+1) and loses to scissors (-(-1))
+    np.testing.assert_allclose(results.payoffs[0, 1], (0.5 * (-1 + 3) + 0.5 * (1 + -1)) / 3)
+    np.testing.assert_allclose(results.win_rates[1, 1], 1 / 3)
+    np.testing.assert_allclose(results.draw_rates[1, 1], 1 / 3)
+
+
+def test_simulated_pairings_agree_with_exact_outcomes():
+    mixed_agents = [randomAgent, MixedStrategyAgent(support_vector=[0.5, 0.25, 0.25], name='Rocky')]
+    sequential_agents = [SequentialAgent(agent.support_vector, agent.name, seed=i) for i, agent in enumerate(mixed_agents)]
+    exact_results     = round_robin_tournament(mixed_agents, env_kwargs={'max_repetitions': 4})
+    simulated_results = round_robin_tournament(sequential_agents, episodes=4000, env_kwargs={'max_repetitions': 4}, confidence=0.999)
+
+    assert not simulated_results.exact.any()
+    assert np.all(simulated_results.payoff_confidence_intervals[..., 0] <= exact_results.payoffs)
+    assert np.all(exact_results.payoffs <= simulated_results.payoff_confidence_intervals[..., 1])
+    assert np.all(simulated_results.win_rate_confidence_intervals[..., 0] <= exact_results.win_rates)
+    assert np.all(exact_results.win_rates <= simulated_results.win_rate_confidence_intervals[..., 1])
+
+
+def test_simulated_pairings_can_run_in_parallel():
+    agents = [SequentialAgent([0, 1, 0], 'Paper'), rockAgent]
+    results = round_robin_tournament(agents, episodes=10, num_workers=2, env_kwargs={'max_repetitions': 3})
+    np.testing.assert_array_equal(results.exact, [[False, False], [False, True]])
+    np.testing.assert_array_equal(results.payoffs, [[0, 3], [-3, 0]])
+
+
+def test_simulated_pairings_are_reproducible_and_independent_of_num_workers():
+    agents = [SequentialAgent([1/3, 1/3, 1/3], 'A', seed=0), SequentialAgent([1/3, 1/3, 1/3], 'B', seed=0)]
+    rng_states = [agent.rng.bit_generator.state for agent in agents]
+    results = round_robin_tournament(agents, episodes=50, seed=0, env_kwargs={'max_repetitions': 2})
+    parallel_results = round_robin_tournament(agents, episodes=50, seed=0, num_workers=2, env_kwargs={'max_repetitions': 2})
+    np.testing.assert_array_equal(results.payoffs, parallel_results.payoffs)
+    # The caller's agents are left untouched
+    assert [agent.rng.bit_generator.state for agent in agents] == rng_states
+    # Identically seeded agents, or an agent playing itself, do not replay the same actions on both sides
+    assert np.all(results.draw_rates < 1)
+    # Every pairing samples its own actions
+    assert len(np.unique(results.payoffs[~np.eye(2, dtype=bool)])) == 2
@@ -7,5 +7,9 @@ setup(name='gym_rock_paper_scissors',
       author='Sarios',
       author_email='rockpapersass@xcape.com',
       packages=find_packages(),
-      install_requires=['gym']
+      install_requires=['gym'],
+      entry_points={
+          'console_scripts': ['rock-paper-scissors-benchmark=gym_rock_paper_scissors.benchmarks.cli:main'],
+          'gym.envs': ['__root__ = gym_rock_paper_scissors:register_envs'],
+      }
       )